@@ -1,8 +1,12 @@
+from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import List, Tuple, Dict
 from itertools import product
 from functools import reduce
-from numpy import sin, cos, tan, radians, sqrt
+from bisect import bisect_right
+from math import comb
+from numpy.linalg import eigvals
+from numpy import sin, cos, tan, radians, sqrt, ndarray, array, asarray, float64, zeros, full, empty, eye, nan, where, flatnonzero, broadcast_to, ndim, searchsorted, clip, array_equal, convolve, concatenate, arange, einsum
 
 @dataclass
 class Vector3:
@@ -44,61 +48,81 @@ class Vector3:
 		return self / self.magnitude()
 
 
+# this class defines a polynomial, whose coefficients are stored lowest degree first without trailing zeros; the polynomials of the solve are
+# small, so a float64 array given to it is kept as it is instead of being copied, and trailing zeros are only looked for when there is one
 @dataclass
 class Polynomial:
-	coefficients: List[float] = field(default_factory=list)
+	coefficients: ndarray = field(default_factory = lambda: zeros(1))
 	degree: int = field(default=0)
 
+	__array_ufunc__ = None  # makes numpy scalars defer their arithmetic with polynomials to the polynomial
+
 	def __post_init__(self):
-		self.degree = len(self.coefficients) - 1
+		coefs: ndarray = self.coefficients
+		if type(coefs) is not ndarray or coefs.dtype != float64:
+			coefs = array(coefs, dtype = float64)
+		if coefs.ndim != 1:
+			coefs = coefs.reshape(-1)
+
+		size: int = len(coefs)
+		if size == 0:
+			coefs = zeros(1)
+		elif size > 1 and coefs[-1] == 0:
+			while size > 1 and coefs[size - 1] == 0:
+				size -= 1
+			coefs = coefs[:size]
+
+		self.coefficients = coefs
+		self.degree = len(coefs) - 1
 
 	def __add__(self, other):
 		if isinstance(other, Polynomial):
-			if other.degree != self.degree:
-				raise Exception("Polynomials must have same degree!")
-			return Polynomial(list(map(lambda pair: pair[0] + pair[1], zip(self.coefficients, other.coefficients))), self.degree)
+			(longer, shorter) = (self.coefficients, other.coefficients) if self.degree >= other.degree else (other.coefficients, self.coefficients)
+			if len(longer) == len(shorter):
+				return Polynomial(longer + shorter)
+
+			_coefs: ndarray = longer.copy()
+			_coefs[:len(shorter)] += shorter
+			return Polynomial(_coefs)
 		else:
-			return Polynomial([coef + i for (coef, i) in zip(self.coefficients, [other] + [0] * self.degree)], self.degree)
+			_coefs: ndarray = self.coefficients.copy()
+			_coefs[0] += other
+			return Polynomial(_coefs)
 
 	def __radd__(self, other):
 		return self + other
 
 	def __eq__(self, other):
-		return reduce(lambda a, b : a and b, list(map(lambda pair : pair[0] == pair[1], zip(self.coefficients, other.coefficients))))
+		return array_equal(self.coefficients, other.coefficients)
 
 	def __sub__(self, other):
-		if isinstance(other, Polynomial):
-			if other.degree != self.degree:
-				raise Exception("Polynomials must have same degree!")
+		return self + (-other)
 
-			return Polynomial(list(map(lambda pair: pair[0] - pair[1], zip(self.coefficients, other.coefficients))), self.degree)
-		else:
-			return Polynomial([coef + i for (coef, i) in zip(self.coefficients, [-other] + [0] * self.degree)], self.degree)
+	def __rsub__(self, other):
+		return (-self) + other
 
 	def __mul__(self, other):
-		if isinstance(other, float) or isinstance(other, int):
-			return Polynomial([coef * other for coef in self.coefficients], self.degree)
-
-		elif isinstance(other, Polynomial):
-			_coefs = [0] * (self.degree + other.degree + 2)
-
-			for (i, coef_s) in enumerate(self.coefficients):
-				for (j, coef_o) in enumerate(other.coefficients):
-					_coefs[i + j] += coef_s * coef_o
-
-			return Polynomial(_coefs, self.degree + other.degree)
+		if isinstance(other, Polynomial):
+			return Polynomial(convolve(self.coefficients, other.coefficients))
+		else:
+			return Polynomial(self.coefficients * other)
 
 	def __rmul__(self, other):
 		return self.__mul__(other)
 
-	def __div__(self, other):
+	def __truediv__(self, other):
 		return self * (1 / other)
 
+	__div__ = __truediv__
+
 	def __neg__(self):
-		return Polynomial([-coef for coef in self.coefficients], self.degree)
+		return Polynomial(-self.coefficients)
 
 	def __call__(self, x):
-		return reduce(lambda a, b: a + b, [coef * (x**i) for (i, coef) in enumerate(self.coefficients)])
+		if isinstance(x, (int, float)):
+			return hornerScalar(self.coefficients.tolist(), x)
+
+		return horner(self.coefficients, x) if ndim(x) > 0 else float(horner(self.coefficients, x))
 
 	def __repr__(self):
 		printable: str = str(self.coefficients[0])
@@ -159,36 +183,237 @@ class Matrix3x3:
 		else:
 			return Matrix3x3([[self[0][0], self[0][1], sub.x], [self[1][0], self[1][1], sub.y], [self[2][0], self[2][1], sub.z]])
 
+# this function evaluates, through Horner's rule, a single polynomial, given the list of its coefficients (lowest degree first), at a single point x
+# with plain floats, which is much faster than going through numpy for the few coefficients of the polynomials of the solve
+def hornerScalar(coefs : List[float], x : float) -> float:
+	result : float = 0.0
+	for c in reversed(coefs):
+		result = result * x + c
+
+	return result
+
+# this function evaluates, through Horner's rule, the polynomials whose coefficients (lowest degree first) lie along the last axis of coefs at the points x;
+# a single polynomial at a single point is evaluated by hornerScalar
+def horner(coefs : ndarray, x : ndarray) -> ndarray:
+	if isinstance(x, (int, float)) and (isinstance(coefs, (list, tuple)) or (isinstance(coefs, ndarray) and coefs.ndim == 1)):
+		return hornerScalar(coefs.tolist() if isinstance(coefs, ndarray) else list(coefs), x)
+
+	coefs = asarray(coefs, dtype = float64)
+	x = asarray(x, dtype = float64)
+	result : ndarray = coefs[..., -1] + 0 * x
+
+	for i in range(coefs.shape[-1] - 2, -1, -1):
+		result = result * x + coefs[..., i]
+
+	return result
+
 def differentiate(p : Polynomial):
-	return Polynomial([coef * (i + 1) for (i, coef) in enumerate(p.coefficients[1:])])
+	return Polynomial(derivativeCoefficients(p.coefficients))
+
+# this function returns the coefficients of the derivatives of the polynomials whose coefficients (lowest degree first) lie along the last axis of coefs
+def derivativeCoefficients(coefs : ndarray) -> ndarray:
+	coefs = asarray(coefs, dtype = float64)
+	return coefs[..., 1:] * arange(1, coefs.shape[-1]) if coefs.shape[-1] > 1 else zeros(coefs.shape)
+
+# this function returns the real roots of the polynomials whose coefficients (lowest degree first) lie along the rows of coefs, with shape (n, d + 1),
+# as a matrix with shape (n, d) padded with nan; the roots of the polynomials of each degree are found at once, as the eigenvalues of their companion matrices
+def realRoots(coefs : ndarray, tolerance : float = 1e-9) -> ndarray:
+	coefs = asarray(coefs, dtype = float64)
+	(n, size) = coefs.shape
+	roots : ndarray = full((n, max(size - 1, 0)), nan)
+
+	nonzero : ndarray = coefs != 0
+	degrees : ndarray = where(nonzero.any(axis = 1), size - 1 - nonzero[:, ::-1].argmax(axis = 1), 0)
+
+	for k in range(1, size):
+		rows : ndarray = flatnonzero(degrees == k)
+		if len(rows) == 0:
+			continue
+
+		# the companion matrix of the monic polynomial has ones below its diagonal and the opposite of the other coefficients on its last column
+		monic : ndarray = coefs[rows, :k]/coefs[rows, k, None]
+		companion : ndarray = zeros((len(rows), k, k))
+		companion[:, arange(1, k), arange(k - 1)] = 1
+		companion[:, :, -1] = -monic
+
+		values : ndarray = eigvals(companion)
+		real : ndarray = abs(values.imag) <= tolerance*(1 + abs(values.real))
+		roots[rows, :k] = where(real, values.real, nan)
+
+	return roots
 
 def integrate(p : Polynomial, lower : float, upper : float):
-	primitive = Polynomial([0] + [coef / (i + 1) for (i, coef) in enumerate(p.coefficients)], p.degree + 1)
-	return primitive(upper) - primitive(lower)
+	P : Polynomial = primitive(p)
+	return P(upper) - P(lower)
 
 def primitive(p: Polynomial):
-	return Polynomial([0] + [coef / (i + 1) for (i, coef) in enumerate(p.coefficients)], p.degree + 1)
+	return Polynomial([0.0] + [c / (i + 1) for (i, c) in enumerate(p.coefficients.tolist())])
+
+# this function returns the coefficients of the primitives, null at zero, of the polynomials whose coefficients (lowest degree first) lie along the last axis of coefs
+def primitiveCoefficients(coefs : ndarray) -> ndarray:
+	coefs = asarray(coefs, dtype = float64)
+	return concatenate((zeros(coefs.shape[:-1] + (1,)), coefs / arange(1, coefs.shape[-1] + 1)), axis = -1)
 
 def det(mat : Matrix3x3) -> float:
 	return mat[0][0]*(mat[1][1]*mat[2][2] - mat[2][1]*mat[1][2]) + mat[0][1]*(mat[1][2]*mat[2][0] - mat[2][2]*mat[1][0]) + mat[0][2]*(mat[1][0]*mat[2][1] - mat[1][1]*mat[2][0])
 
 def solve(coefs : Matrix3x3, b : Vector3) -> Vector3:
-	D : float = det(coefs)
-	Dx : float = det(coefs.subcolumn(0, b))
-	Dy : float = det(coefs.subcolumn(1, b))
-	Dz : float = det(coefs.subcolumn(2, b))
+	(x, singular) = solveBatch(array([coefs.data], dtype = float64), array([[b.x, b.y, b.z]], dtype = float64))
 
-	if D == 0:
-		return Vector3(0, 0, 0)
+	if singular[0]:
+		raise Exception('Matrix is singular!')
 
-	return Vector3(Dx / D, Dy / D, Dz / D)
+	return Vector3(*x[0].tolist())
 
 def invert(m : Matrix3x3) -> Matrix3x3:
-	a : Vector3 = solve(m, Vector3(1, 0, 0))
-	b : Vector3 = solve(m, Vector3(0, 1, 0))
-	c : Vector3 = solve(m, Vector3(0, 0, 1))
+	(inverse, singular) = invertBatch(array([m.data], dtype = float64))
+
+	if singular[0]:
+		raise Exception('Matrix is singular!')
+
+	return Matrix3x3(inverse[0].tolist())
+
+# this function solves a stack of 3x3 systems at once, given their matrices with shape (n, 3, 3) and their right hand sides with shape (n, 3),
+# or (n, 3, k) for k right hand sides each, through Gaussian elimination with partial pivoting vectorized over the stack;
+# it returns the solutions, shaped as the right hand sides, along with a mask of the singular systems, whose solutions are nan
+def solveBatch(A : ndarray, b : ndarray, tolerance : float = 1e-12) -> Tuple[ndarray, ndarray]:
+	A = array(A, dtype = float64)
+	B : ndarray = array(b, dtype = float64)
+	vectors : bool = B.ndim == 2
+	if vectors:
+		B = B[:, :, None]
+
+	n : int = A.shape[0]
+	stack : ndarray = arange(n)
+	scale : ndarray = abs(A).max(axis = (1, 2), initial = 0)
+	singular : ndarray = scale == 0
+
+	for c in range(3):
+		# the row with the largest entry in the column is swapped into the pivot's place
+		p : ndarray = c + abs(A[:, c:, c]).argmax(axis = 1)
+		(A[stack, c], A[stack, p]) = (A[stack, p], A[stack, c].copy())
+		(B[stack, c], B[stack, p]) = (B[stack, p], B[stack, c].copy())
+
+		singular |= abs(A[:, c, c]) <= tolerance*scale
+		pivot : ndarray = where(singular, 1, A[:, c, c])
+
+		for r in range(c + 1, 3):
+			f : ndarray = A[:, r, c]/pivot
+			A[:, r] -= f[:, None]*A[:, c]
+			B[:, r] -= f[:, None]*B[:, c]
+
+	x : ndarray = empty(B.shape)
+	for r in range(2, -1, -1):
+		x[:, r] = (B[:, r] - (A[:, r, r + 1:, None]*x[:, r + 1:]).sum(axis = 1))/where(singular, 1, A[:, r, r])[:, None]
+
+	x[singular] = nan
+	return (x[:, :, 0] if vectors else x, singular)
+
+# this function inverts a stack of 3x3 matrices at once, given with shape (n, 3, 3), through a single elimination with the identity's three columns
+# as right hand sides; it returns the inverses along with a mask of the singular matrices, whose inverses are nan
+def invertBatch(A : ndarray) -> Tuple[ndarray, ndarray]:
+	return solveBatch(A, broadcast_to(eye(3), (len(A), 3, 3)))
+
+# this function solves a tridiagonal system through the Thomas algorithm, in linear time; lower[i] and upper[i] are the coefficients
+# to the left and to the right of diagonal[i] on the i-th row, so lower[0] and upper[-1] are ignored; there is no pivoting,
+# so the system should be diagonally dominant, as the three-moment equations are
+def solveTridiagonal(lower : List[float], diagonal : List[float], upper : List[float], b : List[float]) -> List[float]:
+	n : int = len(diagonal)
+	c : List[float] = [0.0]*n
+	d : List[float] = [0.0]*n
+
+	for i in range(n):
+		m : float = diagonal[i] - (lower[i]*c[i - 1] if i > 0 else 0)
+		if m == 0:
+			raise Exception('Tridiagonal system is singular!')
+
+		c[i] = upper[i]/m if i < n - 1 else 0
+		d[i] = (b[i] - (lower[i]*d[i - 1] if i > 0 else 0))/m
+
+	for i in range(n - 2, -1, -1):
+		d[i] -= c[i]*d[i + 1]
+
+	return d
+
+# this class defines a piecewise polynomial: its k segments are bounded by the k + 1 sorted breakpoints,
+# and each row of the padded coefficient matrix holds a piece written relative to the start of its own segment
+@dataclass
+class PiecewisePolynomial:
+	breakpoints : ndarray = field(default_factory = lambda: zeros(1))
+	coefficients : ndarray = field(default_factory = lambda: zeros((0, 1)))
+
+	def __post_init__(self):
+		self.breakpoints = asarray(self.breakpoints, dtype = float64)
+		self.coefficients = asarray(self.coefficients, dtype = float64)
+
+	# this function builds a piecewise polynomial from a list of polynomials and the breakpoints bounding them
+	@staticmethod
+	def fromPolynomials(pieces : List[Polynomial], breakpoints : List[float]) -> PiecewisePolynomial:
+		coefs : ndarray = zeros((len(pieces), max([len(p.coefficients) for p in pieces], default = 1)))
+
+		for (i, p) in enumerate(pieces):
+			coefs[i, :len(p.coefficients)] = p.coefficients
+
+		return PiecewisePolynomial(breakpoints, coefs)
+
+	def __len__(self) -> int:
+		return self.coefficients.shape[0]
 
-	return Matrix3x3([[a.x, b.x, c.x], [a.y, b.y, c.y], [a.z, b.z, c.z]])
+	# this function returns the polynomial that describes the i-th segment
+	def piece(self, i : int) -> Polynomial:
+		return Polynomial(self.coefficients[i])
+
+	# this function returns the index of the segment that contains the point x
+	def segment(self, x : float) -> int:
+		return min(max(bisect_right(self.breakpoints, x) - 1, 0), len(self) - 1)
+
+	# this function returns the segment that contains each point of xs, along with the points' positions relative to those segments' starts
+	def locate(self, xs : ndarray) -> Tuple[ndarray, ndarray]:
+		xs = asarray(xs, dtype = float64)
+		segments : ndarray = clip(searchsorted(self.breakpoints, xs, side = 'right') - 1, 0, len(self) - 1)
+		return (segments, xs - self.breakpoints[segments])
+
+	def __call__(self, x):
+		if len(self) == 0:
+			raise Exception('Piecewise polynomial has no segments!')
+
+		if ndim(x) == 0:
+			i : int = self.segment(x)
+			return float(horner(self.coefficients[i], x - self.breakpoints[i]))
+
+		(segments, local) = self.locate(x)
+		return horner(self.coefficients[segments], local)
+
+	# this function returns the same piecewise polynomial split at the given breakpoints, which must include its own, each piece rewritten relative
+	# to the start of its new segment through a Taylor shift: the coefficients of p(s + d) are the sums of the binomial coefficients times powers of d
+	def refine(self, breakpoints : ndarray) -> PiecewisePolynomial:
+		breakpoints = asarray(breakpoints, dtype = float64)
+		(segments, local) = self.locate((breakpoints[:-1] + breakpoints[1:])/2)
+		d : ndarray = breakpoints[:-1] - self.breakpoints[segments]
+
+		size : int = self.coefficients.shape[1]
+		shift : ndarray = zeros((len(segments), size, size))
+		for i in range(size):
+			for j in range(i + 1):
+				shift[:, i, j] = comb(i, j)*d**(i - j)
+
+		return PiecewisePolynomial(breakpoints, einsum('ki,kij->kj', self.coefficients[segments], shift))
+
+	# this function returns the piecewise polynomial formed by the derivatives of each piece
+	def derivative(self) -> PiecewisePolynomial:
+		return PiecewisePolynomial.fromPolynomials([differentiate(self.piece(i)) for i in range(len(self))], self.breakpoints)
+
+	# this function returns the continuous primitive of the piecewise polynomial that is worth constant at the first breakpoint
+	def antiderivative(self, constant : float = 0) -> PiecewisePolynomial:
+		pieces : List[Polynomial] = list()
+
+		for i in range(len(self)):
+			p : Polynomial = primitive(self.piece(i))
+			p.coefficients[0] += constant
+			constant = p(self.breakpoints[i + 1] - self.breakpoints[i])
+			pieces.append(p)
+
+		return PiecewisePolynomial.fromPolynomials(pieces, self.breakpoints)
 
 precise_angles : Dict[float, Tuple[float, float, float, float]] = {
 	0   : (0, 1, 0, None),
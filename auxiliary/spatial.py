@@ -0,0 +1,124 @@
+from typing import Dict, List, Set, Tuple, Optional
+from math import floor, hypot, ceil
+
+Coordinates = Tuple[float, float]
+
+# this function returns the distance from the point p to the segment from a to b
+def segmentDistance(p : Coordinates, a : Coordinates, b : Coordinates) -> float:
+	(dx, dy) = (b[0] - a[0], b[1] - a[1])
+	squared : float = dx * dx + dy * dy
+	t : float = 0 if squared == 0 else min(max(((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / squared, 0), 1)
+	return hypot(p[0] - a[0] - t * dx, p[1] - a[1] - t * dy)
+
+# this class indexes segments, each identified by a positive integer, by the cells of a uniform grid they pass near, so that the segment under a point is found
+# by testing only the segments listed in the point's cell; the grid is a dictionary of the cells in use, so it is not bounded by the canvas' size
+class SpatialIndex:
+	def __init__(self, radius : float = 15, cellSize : float = 64):
+		# a segment is listed in the cells of points spaced half a cell apart along it and in their neighbors, which holds every point within the radius
+		# of the segment as long as the cells are at least 4/3 of the radius wide
+		self.radius : float = radius
+		self.cellSize : float = max(cellSize, 4 * radius / 3)
+
+		self.cells : Dict[Tuple[int, int], Set[int]] = dict()
+		self.segments : Dict[int, Tuple[Coordinates, Coordinates, List[Tuple[int, int]]]] = dict()  # each segment's ends and the cells it is listed in
+
+	def __len__(self) -> int:
+		return len(self.segments)
+
+	# this function returns the cell that contains the point p
+	def cell(self, p : Coordinates) -> Tuple[int, int]:
+		return (floor(p[0] / self.cellSize), floor(p[1] / self.cellSize))
+
+	# this function adds the segment from a to b under the given identifier
+	def insert(self, identifier : int, a : Coordinates, b : Coordinates):
+		if identifier in self.segments:
+			self.remove(identifier)
+
+		steps : int = max(ceil(2 * hypot(b[0] - a[0], b[1] - a[1]) / self.cellSize), 1)
+		covered : Set[Tuple[int, int]] = set()
+		for k in range(steps + 1):
+			(cx, cy) = self.cell((a[0] + (b[0] - a[0]) * k / steps, a[1] + (b[1] - a[1]) * k / steps))
+			covered.update((cx + i, cy + j) for i in (-1, 0, 1) for j in (-1, 0, 1))
+
+		for c in covered:
+			self.cells.setdefault(c, set()).add(identifier)
+
+		self.segments[identifier] = (a, b, list(covered))
+
+	# this function removes the segment with the given identifier
+	def remove(self, identifier : int):
+		for c in self.segments.pop(identifier)[2]:
+			self.cells[c].discard(identifier)
+			if len(self.cells[c]) == 0:
+				del self.cells[c]
+
+	# this function returns the identifier of the segment nearest to the point p, among the ones within the radius of it, the lowest one breaking ties,
+	# or 0 when there is none
+	def query(self, p : Coordinates) -> int:
+		nearest : Tuple[float, int] = (self.radius, 0)
+		for identifier in self.cells.get(self.cell(p), ()):
+			(a, b, covered) = self.segments[identifier]
+			candidate : Tuple[float, int] = (segmentDistance(p, a, b), identifier)
+			if candidate[0] <= self.radius and (nearest[1] == 0 or candidate < nearest):
+				nearest = candidate
+
+		return nearest[1]
+
+# this class registers the snap points, the ends of the beams, along with the beams that end at each of them, identified by integers;
+# the points are bucketed by the cell of a uniform grid as wide as the snapping radius, so the points near any point lie in its cell and their neighbors
+class SnapRegistry:
+	def __init__(self, radius : float = 40):
+		self.radius : float = radius
+		self.cells : Dict[Tuple[int, int], Set[Coordinates]] = dict()
+		self.points : Dict[Coordinates, Set[int]] = dict()  # maps each snap point to the beams that end at it
+
+	def __len__(self) -> int:
+		return len(self.points)
+
+	def __iter__(self):
+		return iter(self.points)
+
+	def __contains__(self, p : Coordinates) -> bool:
+		return p in self.points
+
+	# this function returns the cell that contains the point p
+	def cell(self, p : Coordinates) -> Tuple[int, int]:
+		return (floor(p[0] / self.radius), floor(p[1] / self.radius))
+
+	# this function registers that the beam with the given identifier ends at the point p, returning whether p was already a snap point, that is, a joint
+	def add(self, identifier : int, p : Coordinates) -> bool:
+		joint : bool = p in self.points
+		if not joint:
+			self.points[p] = set()
+			self.cells.setdefault(self.cell(p), set()).add(p)
+
+		self.points[p].add(identifier)
+		return joint
+
+	# this function unregisters that the beam with the given identifier ends at the point p, which stops being a snap point when no other beam ends at it
+	def remove(self, identifier : int, p : Coordinates):
+		beams : Set[int] = self.points[p]
+		beams.discard(identifier)
+		if len(beams) == 0:
+			del self.points[p]
+			c : Tuple[int, int] = self.cell(p)
+			self.cells[c].discard(p)
+			if len(self.cells[c]) == 0:
+				del self.cells[c]
+
+	# this function returns the beams that end at the point p
+	def incident(self, p : Coordinates) -> Set[int]:
+		return self.points.get(p, set())
+
+	# this function returns the snap point nearest to the point p within the radius, other than the excluded one, or None when there is none
+	def nearest(self, p : Coordinates, exclude : Optional[Coordinates] = None) -> Optional[Coordinates]:
+		(cx, cy) = self.cell(p)
+		nearest : Tuple[float, Optional[Coordinates]] = (self.radius, None)
+		for i in (-1, 0, 1):
+			for j in (-1, 0, 1):
+				for point in self.cells.get((cx + i, cy + j), ()):
+					d : float = hypot(p[0] - point[0], p[1] - point[1])
+					if point != exclude and d <= nearest[0] and (nearest[1] == None or d < nearest[0] or point < nearest[1]):
+						nearest = (d, point)
+
+		return nearest[1]
@@ -0,0 +1,48 @@
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from json import dumps, loads
+from model import loadModel, solveModel
+
+# models and results cross process boundaries as json strings, or as the paths of the model files, which are much smaller
+# and faster to transfer than pickled graphs of beams, forces and vectors
+
+# this function solves a json serialized model and returns its json serialized result,
+# reporting a model that cannot be solved through the result's error field
+def solveSerialized(payload: str, samples: int = 101, method: str = "equilibrium", tolerance: Optional[float] = None, curveTolerance: Optional[float] = None) -> str:
+	try:
+		return dumps(solveModel(loads(payload), samples, method, tolerance, curveTolerance))
+	except Exception as error:
+		return dumps({"error": str(error)})
+
+# this function solves a model file and returns its json serialized result, reporting a file that cannot be read
+# or a model that cannot be solved through the result's error field
+def solveFile(modelPath: str, samples: int = 101, method: str = "equilibrium", tolerance: Optional[float] = None, curveTolerance: Optional[float] = None) -> str:
+	try:
+		return dumps(solveModel(loadModel(modelPath), samples, method, tolerance, curveTolerance))
+	except Exception as error:
+		return dumps({"error": str(error)})
+
+# this function hands every payload to the solver, spreading them across a pool of worker processes, and yields their results in the same order;
+# workers defaults to the number of processors and a single worker solves the payloads in this process
+def solvePayloads(solver: Callable[[str], str], payloads: Iterable[str], workers: Optional[int], chunksize: int) -> Iterator[Dict[str, Any]]:
+	if workers == 1:
+		for payload in payloads:
+			yield loads(solver(payload))
+		return
+
+	with ProcessPoolExecutor(max_workers = workers) as executor:
+		for result in executor.map(solver, payloads, chunksize = chunksize):
+			yield loads(result)
+
+# this function solves every model of a sequence of independent models, spreading them across a pool of worker processes,
+# and yields their results in the same order; workers defaults to the number of processors and a single worker solves the models in this process
+def solveMany(models: Iterable[Dict[str, Any]], workers: Optional[int] = None, chunksize: int = 1, samples: int = 101, method: str = "equilibrium", tolerance: Optional[float] = None, curveTolerance: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+	solver = partial(solveSerialized, samples = samples, method = method, tolerance = tolerance, curveTolerance = curveTolerance)
+	return solvePayloads(solver, map(dumps, models), workers, chunksize)
+
+# this function solves every model file of a sequence as solveMany does, the files being read by the workers themselves,
+# so that a file that cannot be read only makes its own result an error
+def solveFiles(modelPaths: Iterable[str], workers: Optional[int] = None, chunksize: int = 1, samples: int = 101, method: str = "equilibrium", tolerance: Optional[float] = None, curveTolerance: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+	solver = partial(solveFile, samples = samples, method = method, tolerance = tolerance, curveTolerance = curveTolerance)
+	return solvePayloads(solver, modelPaths, workers, chunksize)
@@ -1,14 +1,22 @@
 from __future__ import annotations
 from typing import List, Tuple, Union
-from auxiliary.algebra import Vector3, Polynomial, psin, pcos, primitive, rotate
+from numpy import ndarray, array, float64
+from auxiliary.algebra import Vector3, PiecewisePolynomial, psin, pcos, rotate
 from force import Concentrated, Distributed, Moment
 from support import Support
+from solution import BeamSolution
 
 # this class defines a beam
 class Beam:
-	def __init__(self, length: float):
+	def __init__(self, length: float, EA: float = 1e6, EI: float = 2e4, mass: float = 0.03925):
 		self.length: float = length
 
+		# these members are the beam's axial and flexural rigidities, which only the stiffness method uses,
+		# and its mass per unit length, which only the modal analysis uses
+		self.EA: float = EA
+		self.EI: float = EI
+		self.mass: float = mass
+
 		# the start and end of the can be attached to other beams and a support
 		self.start: Tuple[Union[Support, None], List[Beam]] = (None, list())
 		self.end: Tuple[Union[Support, None], List[Beam]] = (None, list())
@@ -18,8 +26,10 @@ class Beam:
 		self.distributedList: List[Tuple[Distributed, float, float]] = list()    # position and angle, in that order
 		self.moment: Union[Moment, None] = None
 
-		# this member lists the polynomials that describe the stress on the beams
-		self.stressFunctions: List[Tuple[Tuple[Polynomial, Polynomial, Polynomial], float]] = list()
+	# this function lists the beam's concentrated and distributed forces, or only the ones of a given load case, along with extra concentrated forces
+	# that are not applied on the beam itself, such as the unit loads of the influence lines
+	def loads(self, case: Union[str, None] = None, extraLoads: Union[List[Tuple[Concentrated, float, float]], None] = None) -> List[Tuple[Union[Concentrated, Distributed], float, float]]:
+		return [f for f in self.concentratedList + list(extraLoads or ()) + self.distributedList if case == None or f[0].case == case]
 
 	# this function returns the coresponding vector to a point along the beam, given its starting position vector and angle
 	def pointPos(self, startPos: Vector3, point: float, angle: float) -> Vector3:
@@ -28,23 +38,33 @@ class Beam:
 
 		return startPos + Vector3(point*pcos(angle), point*psin(angle), 0)
 
-	# this function recieves the reaction vector at one of the beam's end, its reaction vector at that end,
-	# finds the stress functions on the beam and returns the reaction vector at the other end
-	def solve(self, reaction: Vector3, angle: float, endFirst: bool) -> Vector3:
-		forces: List[Tuple[Union[Concentrated, Distributed], float, float]] = sorted(self.concentratedList + self.distributedList, key = lambda v: v[1], reverse = endFirst)
+	# this function recieves the reaction vector at one of the beam's end, its reaction vector at that end and the reactions of the supports at its start and end,
+	# finds the stress functions on the beam and returns the reaction vector at the other end along with them, leaving the beam untouched;
+	# given a load case, only the loads of that case are taken into account, and extra concentrated forces are taken into account as if applied on the beam
+	def solve(self, reaction: Vector3, angle: float, endFirst: bool, supportReactions: Tuple[Union[Vector3, None], Union[Vector3, None]], case: Union[str, None] = None, extraLoads: Union[List[Tuple[Concentrated, float, float]], None] = None) -> Tuple[Vector3, BeamSolution]:
+		forces: List[Tuple[Union[Concentrated, Distributed], float, float]] = sorted(self.loads(case, extraLoads), key = lambda v: v[1], reverse = endFirst)
 
-		resulting: Vector3 = -reaction if endFirst else reaction
+		resulting: Vector3 = -reaction if endFirst else reaction.__copy__()
 		pos: float = self.length if endFirst else 0
 
+		# the coefficients of each segment's normal, shear and bending stress polynomials, paired with the segment's end; they are kept as lists of floats
+		# and each diagram's padded coefficient matrix is built from them at once, which is much faster than going through a Polynomial per segment
+		functions: List[Tuple[Tuple[List[float], List[float], List[float]], float]] = list()
+
 		for force in forces:
 			prev: float = pos
 			pos = force[1]
 			if isinstance(force[0], Distributed) and endFirst:
 				pos += force[0].length
 
-			self.stressFunctions.append(((Polynomial([-resulting.x]), Polynomial([resulting.y]), Polynomial([-resulting.z, resulting.y])), prev if endFirst else pos))
+			# each segment's polynomials are written relative to its start, which is the point reached last when solving from the end
+			if endFirst:
+				resulting.z -= resulting.y*(pos - prev)
+
+			functions.append((([-resulting.x], [resulting.y], [-resulting.z, resulting.y]), prev if endFirst else pos))
 
-			resulting.z -= resulting.y*(pos - prev)
+			if not endFirst:
+				resulting.z -= resulting.y*(pos - prev)
 			v: Vector3
 			if isinstance(force[0], Distributed):
 				prev = pos
@@ -58,14 +78,12 @@ class Beam:
 
 				t: Tuple[Distributed, Distributed] = force[0].angledComponents(force[2])
 
-				n: Polynomial= primitive(t[0].distribution)
-				n.coefficients[0] -= resulting.x
-				s: Polynomial = primitive(-t[1].distribution)
-				s.coefficients[0] += resulting.y
-				b = primitive(Polynomial(s.coefficients.copy()))
-				b.coefficients[0] -= resulting.z
+				# the stresses are the primitives of the load's components, and the bending stress is the primitive of the shear stress
+				n: List[float] = [-resulting.x] + [c/(i + 1) for (i, c) in enumerate(t[0].distribution.coefficients.tolist())]
+				s: List[float] = [resulting.y] + [-c/(i + 1) for (i, c) in enumerate(t[1].distribution.coefficients.tolist())]
+				b: List[float] = [-resulting.z] + [c/(i + 1) for (i, c) in enumerate(s)]
 
-				self.stressFunctions.append(((n, s, b), prev if endFirst else pos))
+				functions.append(((n, s, b), prev if endFirst else pos))
 
 				if not endFirst:
 					resulting.z -= resulting.y*(pos - prev) + v.y*(pos - prev - equivalent[1])
@@ -81,27 +99,20 @@ class Beam:
 		if endFirst:
 			resulting.z += resulting.y*pos
 
-		self.stressFunctions.append(((Polynomial([-resulting.x]), Polynomial([resulting.y]), Polynomial([-resulting.z, resulting.y])), pos if endFirst else self.length))
+		functions.append((([-resulting.x], [resulting.y], [-resulting.z, resulting.y]), pos if endFirst else self.length))
 		if endFirst:
-			self.stressFunctions.reverse()
-			if self.start[0] != None:
-				resulting -= rotate(self.start[0].reaction, -angle)
+			functions.reverse()
+			if supportReactions[0] != None:
+				resulting -= rotate(supportReactions[0], -angle)
 		else:
 			resulting.z -= resulting.y*(self.length - pos)
-			if self.end[0] != None:
-				resulting -= rotate(self.end[0].reaction, -angle)
+			if supportReactions[1] != None:
+				resulting -= rotate(supportReactions[1], -angle)
 
-		return -resulting if endFirst else resulting
+		breakpoints: ndarray = array([0] + [f[1] for f in functions], dtype = float64)
+		stressFunctions: List[PiecewisePolynomial] = list()
+		for polyID in range(3):
+			width: int = max(len(f[0][polyID]) for f in functions)
+			stressFunctions.append(PiecewisePolynomial(breakpoints, array([f[0][polyID] + [0.0]*(width - len(f[0][polyID])) for f in functions], dtype = float64)))
 
-	# this function returns the stress at a given point x on the beam
-	def stress(self, polyID: int, x: float) -> float:  # the polyID corresponds to the normal, shear and bending stress types, respectively
-		p: float = 0
-		for i in range(len(self.stressFunctions)):
-			if x < self.stressFunctions[i][1]:
-				p = self.stressFunctions[i - 1][1] if i > 0 else 0
-				return self.stressFunctions[i][0][polyID](x - p)
-
-		if len(self.stressFunctions) > 0:
-			return self.stressFunctions[-1][0][polyID](x - p)
-		else:
-			raise Exception('Beam has not been solved yet!')
+		return (-resulting if endFirst else resulting, BeamSolution(tuple(stressFunctions)))
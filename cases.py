@@ -0,0 +1,85 @@
+from typing import List, Tuple, Dict, Union
+from math import prod
+from numpy import ndarray, array, zeros, union1d, float64
+from beam import Beam
+from auxiliary.algebra import PiecewisePolynomial
+from solution import Solution, BeamSolution
+
+# as the analysis is linear, the solution for any combination of load cases is the same combination of the solutions for each case;
+# each case's diagrams are rewritten over the union of all cases' breakpoints, so that every diagram of every beam is a row of one matrix
+# per case and any number of combinations is found through a single product of the combinations' weights by the stacked matrices
+
+# this class holds the solutions of a system for each of its load cases, from which the solution for any weighted combination of them is found;
+# the system's beams are given as well, so that a system without load cases has a basis whose combinations are all zero
+class CaseBasis:
+	def __init__(self, cases: List[str], solutions: List[Solution], beams: List[Beam]):
+		self.cases: List[str] = cases
+		self.supported: List[Tuple[bool, bool]] = [(b.start[0] != None, b.end[0] != None) for b in beams]  # whether each beam's start and end have a support
+		self.reactions: ndarray = array([[[r if r != None else (0, 0, 0) for r in ends] for ends in s.reactions] for s in solutions], dtype = float64).reshape(len(cases), len(beams), 2, 3)
+
+		# the union of the breakpoints of every case's diagrams on each beam, or None for the beams left unsolved,
+		# and the offset of each beam's first segment in the stacked matrices
+		self.breakpoints: List[Union[ndarray, None]] = list()
+		self.offsets: List[int] = list()
+		segments: int = 0
+		degree: int = 1
+		for i in range(len(self.supported)):
+			if any(s.beams[i] == None for s in solutions):
+				self.breakpoints.append(None)
+			else:
+				breakpoints: ndarray = array([0, beams[i].length], dtype = float64)
+				for s in solutions:
+					for f in s.beams[i].stressFunctions:
+						breakpoints = union1d(breakpoints, f.breakpoints)
+						degree = max(degree, f.coefficients.shape[1])
+				self.breakpoints.append(breakpoints)
+
+			self.offsets.append(segments)
+			segments += len(self.breakpoints[-1]) - 1 if self.breakpoints[-1] is not None else 0
+
+		# the coefficients of every case's normal, shear and bending stress functions, stacked with shape (cases, 3, segments, degree + 1)
+		self.coefficients: ndarray = zeros((len(cases), 3, segments, degree))
+		for (c, s) in enumerate(solutions):
+			for (i, breakpoints) in enumerate(self.breakpoints):
+				if breakpoints is None:
+					continue
+
+				for (polyID, f) in enumerate(s.beams[i].stressFunctions):
+					refined: PiecewisePolynomial = f.refine(breakpoints)
+					self.coefficients[c, polyID, self.offsets[i]:self.offsets[i] + len(refined), :refined.coefficients.shape[1]] = refined.coefficients
+
+	# this function returns the weight of each case in a combination, given as a mapping from cases to weights, in which missing cases weigh nothing
+	def weights(self, combination: Dict[str, float]) -> ndarray:
+		for case in combination:
+			if not case in self.cases:
+				raise Exception('Load case is not defined!')
+
+		return array([combination.get(case, 0) for case in self.cases], dtype = float64)
+
+	# this function combines the cases' solutions with the weights in each row of a matrix with shape (combinations, cases), returning the stress functions'
+	# coefficients, shaped (combinations, 3, segments, degree + 1), and the supports' reactions, shaped (combinations, beams, 2, 3), for every combination
+	def combineMany(self, weights: ndarray) -> Tuple[ndarray, ndarray]:
+		weights = array(weights, dtype = float64, ndmin = 2)
+		coefficients: ndarray = (weights @ self.coefficients.reshape(len(self.cases), prod(self.coefficients.shape[1:]))).reshape((len(weights),) + self.coefficients.shape[1:])
+		reactions: ndarray = (weights @ self.reactions.reshape(len(self.cases), prod(self.reactions.shape[1:]))).reshape((len(weights),) + self.reactions.shape[1:])
+		return (coefficients, reactions)
+
+	# this function builds the solution for a combination from its stress functions' coefficients and its supports' reactions, as returned by combineMany
+	def solution(self, coefficients: ndarray, reactions: ndarray) -> Solution:
+		beams: List[Union[BeamSolution, None]] = list()
+		for (i, breakpoints) in enumerate(self.breakpoints):
+			if breakpoints is None:
+				beams.append(None)
+			else:
+				rows: slice = slice(self.offsets[i], self.offsets[i] + len(breakpoints) - 1)
+				beams.append(BeamSolution(tuple(PiecewisePolynomial(breakpoints, coefficients[polyID, rows]) for polyID in range(3))))
+
+		return Solution(
+			tuple(tuple(tuple(reactions[i, side].tolist()) if supported else None for (side, supported) in enumerate(ends)) for (i, ends) in enumerate(self.supported)),
+			tuple(beams)
+		)
+
+	# this function returns the solution for a combination of the load cases, given as a mapping from cases to weights
+	def combine(self, combination: Dict[str, float]) -> Solution:
+		(coefficients, reactions) = self.combineMany(self.weights(combination))
+		return self.solution(coefficients[0], reactions[0])
@@ -0,0 +1,259 @@
+from typing import List, Tuple, Dict, Union
+from math import isclose
+from numpy import ndarray, array, arange, bincount, float64
+from auxiliary.algebra import Vector3, solveTridiagonal, rotate, psin, pcos
+from beam import Beam
+from force import Distributed
+from support import Support
+from solution import Solution, BeamSolution
+
+# a continuous beam is a chain of collinear beams joined end to end, each one drawn either way, a beam drawn backwards being turned around along
+# with its loads; its supports' moments are the unknowns of Clapeyron's three-moment equations, whose matrix is tridiagonal, so the whole beam
+# is solved in time proportional to its number of spans.
+# Every inner joint must have a simple or pinned support, while each end may have any support or none, hanging as a cantilever;
+# the axial reactions are taken by the first pinned or fixed support, the other ones being taken as free to slide along the beam,
+# and, as in Beam.solve, the beams' moments are not taken into account
+
+# this function tells whether two angles, in degrees, point the same way
+def sameDirection(a: float, b: float) -> bool:
+	return isclose((a - b + 180) % 360, 180, abs_tol = 1e-9)
+
+# this function splits the beams, given the joints at their start and end, into chains of beams joined end to end, listed from start to end,
+# each beam paired with whether it is drawn backwards, from the chain's end towards its start; a chain is walked from a joint that only one beam
+# reaches, starting from the beams' starts first, so that a chain whose beams are all drawn the same way is listed in their direction
+def findChains(beams: List[Tuple[Beam, Vector3, float, Vector3]], beamJoints: List[Tuple[int, int]]) -> List[List[Tuple[int, bool]]]:
+	jointBeams: Dict[int, List[Tuple[int, int]]] = dict()  # the beams at each joint, along with the end they are attached at
+	for (i, joints) in enumerate(beamJoints):
+		for (side, joint) in enumerate(joints):
+			jointBeams.setdefault(joint, list()).append((i, side))
+
+	if any(len(attached) > 2 for attached in jointBeams.values()):
+		raise Exception('System is not a continuous beam!')
+
+	chains: List[List[Tuple[int, bool]]] = list()
+	visited: List[bool] = [False]*len(beams)
+	for first in (0, 1):
+		for (i, joints) in enumerate(beamJoints):
+			if visited[i] or len(jointBeams[joints[first]]) != 1:
+				continue
+
+			(k, backwards) = (i, first == 1)
+			angle: float = beams[i][2] + (180 if backwards else 0)
+			chain: List[Tuple[int, bool]] = list()
+			while True:
+				visited[k] = True
+				chain.append((k, backwards))
+				following: List[Tuple[int, int]] = [(j, side) for (j, side) in jointBeams[beamJoints[k][0 if backwards else 1]] if j != k]
+				if len(following) == 0:
+					break
+
+				(k, backwards) = (following[0][0], following[0][1] == 1)
+				if not sameDirection(beams[k][2] + (180 if backwards else 0), angle):
+					raise Exception('System is not a continuous beam!')
+			chains.append(chain)
+
+	if not all(visited):
+		raise Exception('System is not a continuous beam!')
+
+	return chains
+
+# this function finds, for every span of a chain at once, the terms of the three-moment equations that come from its loads: the sums of its loads'
+# components along and across the beam and of their moments about its start, from which follow the stresses at its end when there is no reaction
+# at its start, and the integrals of the bending stress it then has, alone and times x; the loads are only gathered here, one span at a time,
+# and every sum is taken over every load of every span at once. As in Beam.solve, a distributed load counts as its equivalent concentrated force
+# beyond it, while along it the bending stress is the double primitive of its component across the beam. The terms of a beam drawn backwards
+# are found in its own coordinates and then turned around, so that all of them are given along the chain
+def loadTerms(beams: List[Tuple[Beam, Vector3, float, Vector3]], chain: List[Tuple[int, bool]]) -> Tuple[ndarray, ndarray, ndarray]:
+	n: int = len(chain)
+	lengths: ndarray = array([beams[i][0].length for (i, backwards) in chain], dtype = float64)
+
+	spans: List[int] = list()
+	forces: List[Tuple[float, float, float]] = list()  # each concentrated force's position and components
+	distributedSpans: List[int] = list()
+	distributed: List[Tuple[float, float, float, float]] = list()  # each distributed force's position, length and angle's sine and cosine
+	distributions: List[List[float]] = list()
+	for (k, (i, backwards)) in enumerate(chain):
+		for force in beams[i][0].loads():
+			if isinstance(force[0], Distributed):
+				distributedSpans.append(k)
+				distributed.append((force[1], force[0].length, psin(force[2]), pcos(force[2])))
+				distributions.append(force[0].distribution.coefficients.tolist())
+			else:
+				v: Vector3 = force[0].forceVector(force[2])
+				spans.append(k)
+				forces.append((force[1], v.x, v.y))
+
+	# the concentrated forces' bending stress is v.y (x - a) beyond their position a
+	(a, vx, vy) = array(forces, dtype = float64).reshape(-1, 3).T
+	l: ndarray = lengths[spans]
+	terms: List[Tuple[ndarray, ndarray]] = [(array(spans, dtype = int), array([vx, vy, vy*a, vy*(l - a)**2/2, vy*((l**3 - a**3)/3 - a*(l**2 - a**2)/2)]))]
+
+	if len(distributed) > 0:
+		# a distribution p of length h is equivalent to a force of magnitude I, the integral of p, applied at Q/I, Q being the integral of x p,
+		# while the component across the beam that Beam.solve integrates along it is t = sin(angle) p + cos(angle) x
+		(a, h, sine, cosine) = array(distributed, dtype = float64).T
+		width: int = max(2, max(len(p) for p in distributions))
+		p: ndarray = array([c + [0.0]*(width - len(c)) for c in distributions], dtype = float64)
+		t: ndarray = sine[:, None]*p
+		t[:, 1] += cosine
+
+		i: ndarray = arange(width)
+		hs: ndarray = h[:, None]**(i + 1)
+		I: ndarray = (p*hs/(i + 1)).sum(axis = 1)
+		Q: ndarray = (p*hs*h[:, None]/(i + 2)).sum(axis = 1)
+		(vx, vy, g) = (I*cosine, -I*sine, sine*Q)
+
+		# along the load the bending stress is -T, T being the double primitive of t, and beyond it, from b on, it is v.y (x - a) + g
+		l = lengths[distributedSpans]
+		b: ndarray = a + h
+		T: ndarray = t/((i + 1)*(i + 2))
+		inside: ndarray = -(T*hs*h[:, None]**2/(i + 3)).sum(axis = 1)
+		insideWeighted: ndarray = -(T*(a[:, None]*hs*h[:, None]**2/(i + 3) + hs*h[:, None]**3/(i + 4))).sum(axis = 1)
+		terms.append((array(distributedSpans, dtype = int), array([
+			vx, vy, vy*a - g,
+			inside + vy*((l - a)**2 - h**2)/2 + g*(l - b),
+			insideWeighted + vy*((l**3 - b**3)/3 - a*(l**2 - b**2)/2) + g*(l**2 - b**2)/2
+		])))
+
+	(sx, sy, moment, integral, weighted) = sum(array([bincount(k, weights = w, minlength = n) for w in values]) for (k, values) in terms)
+	ends: ndarray = array([-sx, sy, sy*lengths - moment]).T
+
+	# along the chain, x' = L - x, a beam drawn backwards has no reaction at its end, where its bending stress in its own coordinates, M0 - sy x + moment,
+	# vanishes, and the chain's bending stress is the opposite of it; its stresses at the chain's end of it are the ones at its own start
+	flipped: ndarray = array([backwards for (i, backwards) in chain], dtype = bool)
+	if flipped.any():
+		l: ndarray = lengths[flipped]
+		mirroredIntegral: ndarray = integral[flipped] - sy[flipped]*l**2/2 + moment[flipped]*l
+		mirroredWeighted: ndarray = weighted[flipped] - sy[flipped]*l**3/3 + moment[flipped]*l**2/2
+		ends[flipped] = array([sx[flipped], -sy[flipped], -moment[flipped]]).T
+		integral[flipped] = -mirroredIntegral
+		weighted[flipped] = mirroredWeighted - l*mirroredIntegral
+
+	return (ends, integral, weighted)
+
+# this function solves a chain of collinear beams, given its beams' indices from start to end along with whether each one is drawn backwards,
+# filling in their solutions and their supports' reactions
+def solveChain(beams: List[Tuple[Beam, Vector3, float, Vector3]], chain: List[Tuple[int, bool]], solution: List[Union[BeamSolution, None]], reactions: List[List[Union[Vector3, None]]]):
+	n: int = len(chain)
+	angle: float = (beams[chain[0][0]][2] + 180) % 360 if chain[0][1] else beams[chain[0][0]][2]
+	lengths: List[float] = [beams[i][0].length for (i, backwards) in chain]
+
+	# the support at each joint of the chain, along with the beam it is attached to and the end it is attached at
+	supports: List[Union[Tuple[Support, int, int], None]] = [None]*(n + 1)
+	for (k, (i, backwards)) in enumerate(chain):
+		for (side, support) in enumerate((beams[i][0].start[0], beams[i][0].end[0])):
+			j: int = k + (1 - side if backwards else side)
+			if support != None:
+				if supports[j] != None:
+					raise Exception('Joint has more than one support!')
+				supports[j] = (support, i, side)
+
+	for j in range(1, n):
+		if supports[j] == None or supports[j][0].reaction.z != 0:
+			raise Exception('Every inner joint of a continuous beam needs a simple or pinned support!')
+
+	if sum(s != None for s in supports) < 2 and all(s == None or s[0].reaction.z == 0 for s in supports):
+		raise Exception('System is hypostatic!')
+
+	# a simply supported span's bending stress is the one it has with no reaction at its start plus the line that vanishes at both of its ends,
+	# and the integrals of x and L - x times it make up the equations' right hand side
+	(endStresses, integral, weighted) = loadTerms(beams, chain)
+	ends: List[Tuple[float, float, float]] = [tuple(e) for e in endStresses.tolist()]  # the stresses at each span's end when there is no reaction at its start
+	l: ndarray = array(lengths, dtype = float64)
+	r: ndarray = -endStresses[:, 2]/l
+	left: List[float] = (weighted + r*l**3/3).tolist()              # the integral of x times each span's simply supported bending stress
+	right: List[float] = (l*integral - weighted + r*l**3/6).tolist()  # the integral of L - x times it
+
+	# the equation of each joint relates its moment to its neighbors': a cantilever end's moment is zero and fixes the moment at the
+	# support next to it, a fixed end's rotation is zero and an inner support's rotation is the same on both spans
+	lower: List[float] = [0.0]*(n + 1)
+	diagonal: List[float] = [1.0]*(n + 1)
+	upper: List[float] = [0.0]*(n + 1)
+	b: List[float] = [0.0]*(n + 1)
+	for j in range(n + 1):
+		if j == 1 and supports[0] == None:
+			b[j] = ends[0][2]
+		elif j == n - 1 and supports[n] == None:
+			b[j] = ends[-1][1]*lengths[-1] - ends[-1][2]
+		elif j == 0 or j == n:
+			if supports[j] != None and supports[j][0].reaction.z != 0:
+				k: int = 0 if j == 0 else n - 1
+				diagonal[j] = 2*lengths[k]
+				(lower if j == n else upper)[j] = lengths[k]
+				b[j] = -6*(right[k] if j == 0 else left[k])/lengths[k]
+		else:
+			lower[j] = lengths[j - 1]
+			diagonal[j] = 2*(lengths[j - 1] + lengths[j])
+			upper[j] = lengths[j]
+			b[j] = -6*(left[j - 1]/lengths[j - 1] + right[j]/lengths[j])
+
+	moments: List[float] = solveTridiagonal(lower, diagonal, upper, b)
+
+	# each span's reaction vector at its start follows from the moments at its ends, except a cantilever's, which has no reaction at its free end
+	reactionVectors: List[Vector3] = list()
+	for k in range(n):
+		if k == 0 and supports[0] == None:
+			reactionVectors.append(Vector3(0, 0, 0))
+		else:
+			reactionVectors.append(Vector3(0, (moments[k + 1] - moments[k] - ends[k][2])/lengths[k], -moments[k]))
+
+	# the supports' reactions along the beam's normal are the jumps in shear stress across them, and the simple supports' reactions along the beam follow from their angle
+	normals: List[float] = [0.0]*(n + 1)
+	axials: List[float] = [0.0]*(n + 1)
+	anchor: Union[int, None] = None
+	for j in range(n + 1):
+		if supports[j] == None:
+			continue
+
+		normals[j] = (reactionVectors[j].y if j < n else 0) - (ends[j - 1][1] + reactionVectors[j - 1].y if j > 0 else 0)
+		direction: Vector3 = rotate(supports[j][0].reaction, -angle)
+		if supports[j][0].reaction.x == 1 and supports[j][0].reaction.y == 1:
+			if anchor == None:
+				anchor = j
+		elif isclose(direction.y, 0, abs_tol = 1e-12):
+			raise Exception('System is hypostatic!')
+		else:
+			axials[j] = normals[j]*direction.x/direction.y
+
+	# the loads along the beam are the opposite of the normal stress at each span's end when there is no reaction at its start
+	axialLoad: float = sum(axials) - sum(end[0] for end in ends)
+	if anchor != None:
+		axials[anchor] = -axialLoad
+	elif not isclose(axialLoad, 0, abs_tol = 1e-9):
+		raise Exception('System is hypostatic!')
+
+	normal: float = 0
+	for k in range(n):
+		normal += axials[k]
+		reactionVectors[k].x = normal
+		normal -= ends[k][0]
+
+		# a beam drawn backwards is solved from its end, where the reaction vector in its own coordinates is turned around
+		(i, backwards) = chain[k]
+		if backwards:
+			solution[i] = beams[i][0].solve(Vector3(-reactionVectors[k].x, -reactionVectors[k].y, reactionVectors[k].z), beams[i][2], True, (None, None))[1]
+		else:
+			solution[i] = beams[i][0].solve(reactionVectors[k], angle, False, (None, None))[1]
+
+	for j in range(n + 1):
+		if supports[j] != None:
+			(support, i, side) = supports[j]
+			z: float = 0
+			if support.reaction.z != 0:
+				z = reactionVectors[0].z if j == 0 else moments[n]
+			reactions[i][side] = rotate(Vector3(axials[j], normals[j], z), angle)
+
+# this function solves a system made of continuous beams, given its beams and the joints at their start and end
+def solveContinuous(beams: List[Tuple[Beam, Vector3, float, Vector3]], beamJoints: List[Tuple[int, int]]) -> Solution:
+	solution: List[Union[BeamSolution, None]] = [None]*len(beams)
+	reactions: List[List[Union[Vector3, None]]] = [[None, None] for beam in beams]
+
+	chains: List[List[Tuple[int, bool]]] = findChains(beams, beamJoints)
+	for chain in chains:
+		solveChain(beams, chain, solution, reactions)
+
+	return Solution(
+		tuple(tuple((r.x, r.y, r.z) if r != None else None for r in ends) for ends in reactions),
+		tuple(solution),
+		tuple(i for chain in chains for (i, backwards) in chain)
+	)
@@ -0,0 +1,95 @@
+from typing import List, Tuple
+from numpy import ndarray, array, asarray, zeros, concatenate, diff, cumsum, repeat, arange, flatnonzero, searchsorted, clip, einsum, float64
+from auxiliary.algebra import PiecewisePolynomial, horner, primitiveCoefficients
+from solution import Solution, DiagramSamples, samplePieces
+from stiffness import Frame
+
+# the elastic curves of an Euler-Bernoulli beam follow from its stresses: the axial displacement is the primitive of N/EA, the rotation is the primitive
+# of M/EI and the deflection, normal to the beam, is the primitive of the rotation; each curve is continuous along the beam, and its constants are fixed by
+# the displacements of the beam's ends found by the stiffness method, the rotation at the start being the one that makes both ends' deflections match
+
+# this class holds the axial displacement, the deflection and the rotation along every beam of a solved frame, in each beam's local coordinates;
+# the pieces of every beam are stacked, so that the curves are integrated for every beam at once and evaluated at points on any beams at once
+class Deflections:
+	def __init__(self, frame: Frame, displacements: ndarray, solution: Solution):
+		self.breakpoints: List[ndarray] = [b.stressFunctions[0].breakpoints for b in solution.beams]
+		counts: List[int] = [len(breakpoints) - 1 for breakpoints in self.breakpoints]
+		self.offsets: ndarray = cumsum([0] + counts)  # the index of each beam's first piece, followed by the number of pieces
+		self.starts: ndarray = concatenate([breakpoints[:-1] for breakpoints in self.breakpoints])  # the start of each piece along its beam
+		self.angles: ndarray = frame.transforms[:, 0, :2]  # the cosine and sine of each beam's angle
+
+		# the beams laid end to end, so that the piece of a point on any beam is found by a single binary search
+		lengths: ndarray = array([breakpoints[-1] for breakpoints in self.breakpoints], dtype = float64)
+		self.origins: ndarray = cumsum(concatenate(([0], lengths[:-1])))
+		owners: ndarray = repeat(arange(len(counts)), counts)
+		self.positions: ndarray = self.origins[owners] + self.starts  # the start of each piece with the beams laid end to end
+
+		rank: ndarray = arange(len(owners)) - self.offsets[owners]  # the index of each piece along its beam
+		h: ndarray = concatenate([diff(breakpoints) for breakpoints in self.breakpoints])
+		last: ndarray = self.offsets[1:] - 1
+
+		# this function integrates the stacked pieces into curves that are continuous along each beam and worth the given values at the beams' starts;
+		# the pieces are chained one rank at a time, which takes as many steps as the most pieces on a beam
+		def integrate(coefs: ndarray, initial: ndarray) -> ndarray:
+			p: ndarray = primitiveCoefficients(coefs)
+			ends: ndarray = horner(p, h)
+			constants: ndarray = initial[owners]
+			for j in range(1, int(rank.max()) + 1):
+				pieces: ndarray = flatnonzero(rank == j)
+				constants[pieces] = constants[pieces - 1] + ends[pieces - 1]
+
+			p[:, 0] += constants
+			return p
+
+		# this function adds to a curve the line that makes it worth the given values at the beams' ends, returning the line's slope
+		def adjust(curve: ndarray, final: ndarray) -> ndarray:
+			slope: ndarray = (final - horner(curve[last], h[last]))/lengths
+			curve[:, 0] += slope[owners]*self.starts
+			curve[:, 1] += slope[owners]
+			return slope
+
+		size: int = max(f.coefficients.shape[1] for b in solution.beams for f in b.stressFunctions)
+		normal: ndarray = zeros((len(owners), size))
+		bending: ndarray = zeros((len(owners), size))
+		for (b, start, end) in zip(solution.beams, self.offsets[:-1], self.offsets[1:]):
+			for (stacked, f) in ((normal, b.stressFunctions[0]), (bending, b.stressFunctions[2])):
+				stacked[start:end, :f.coefficients.shape[1]] = f.coefficients
+		EA: ndarray = array([b[0].EA for b in frame.beams], dtype = float64)
+		EI: ndarray = array([b[0].EI for b in frame.beams], dtype = float64)
+		ends: ndarray = einsum('mij,mj->mi', frame.transforms, displacements[frame.dofs])  # each beam's end displacements, in its local coordinates
+
+		axial: ndarray = integrate(normal/EA[owners, None], ends[:, 0])
+		adjust(axial, ends[:, 3])
+		rotation: ndarray = integrate(bending/EI[owners, None], zeros(len(counts)))
+		deflection: ndarray = integrate(rotation, ends[:, 1])
+		rotation[:, 0] += adjust(deflection, ends[:, 4])[owners]
+
+		# the coefficients of each piece of the axial displacement, deflection and rotation, stacked with shape (3, pieces, degree + 1)
+		self.coefficients: ndarray = zeros((3, len(owners), size + 2))
+		for (k, curve) in enumerate((axial, deflection, rotation)):
+			self.coefficients[k, :, :curve.shape[1]] = curve
+
+	# this function returns the axial displacement, deflection and rotation along the i-th beam as piecewise polynomials
+	def beam(self, i: int) -> Tuple[PiecewisePolynomial, PiecewisePolynomial, PiecewisePolynomial]:
+		pieces: slice = slice(self.offsets[i], self.offsets[i + 1])
+		return tuple(PiecewisePolynomial(self.breakpoints[i], curve[pieces]) for curve in self.coefficients)
+
+	# this function samples the axial displacement, deflection and rotation along the i-th beam piece by piece, as solution.samplePieces does,
+	# given the tolerance of each; the samples' stresses hold the three curves, in that order
+	def sample(self, i: int, tolerances: Tuple[float, float, float], limit: int = 64) -> DiagramSamples:
+		return samplePieces(self.breakpoints[i], self.coefficients[:, self.offsets[i]:self.offsets[i + 1]], tolerances, limit)
+
+	# this function returns the axial displacement, deflection and rotation at points given by the indices of their beams and their positions along them,
+	# stacked with shape (3, points)
+	def evaluate(self, beams: ndarray, xs: ndarray) -> ndarray:
+		beams = asarray(beams, dtype = int)
+		xs = asarray(xs, dtype = float64)
+		pieces: ndarray = searchsorted(self.positions, self.origins[beams] + xs, side = 'right') - 1
+		pieces = clip(pieces, self.offsets[beams], self.offsets[beams + 1] - 1)
+		return horner(self.coefficients[:, pieces], xs - self.starts[pieces])
+
+	# this function returns the displacements at points given as in evaluate, along the global x and y axes, stacked with shape (2, points)
+	def displacements(self, beams: ndarray, xs: ndarray) -> ndarray:
+		(axial, deflection, rotation) = self.evaluate(beams, xs)
+		(c, s) = self.angles[asarray(beams, dtype = int)].T
+		return array([axial*c - deflection*s, axial*s + deflection*c])
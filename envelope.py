@@ -0,0 +1,110 @@
+from __future__ import annotations
+from typing import List, Dict, Tuple, Union
+from math import prod
+from numpy import ndarray, array, zeros, full, linspace, searchsorted, clip, unique, concatenate, inf, nan, float64, int64
+from auxiliary.algebra import horner
+from solution import Solution
+from cases import CaseBasis
+
+# an envelope keeps, at each point of a fixed grid along each beam, the largest and smallest normal, shear and bending stress found so far
+# and the load case they were found for; solutions are consumed one at a time and dropped, and the names of the cases that stop governing any point
+# are dropped once they outnumber the ones that do, so the memory it takes does not grow with the number of cases
+
+# this class accumulates the envelope of the solutions of a system for many load cases
+class Envelope:
+	def __init__(self, grids: List[ndarray]):
+		# the grids of every beam are laid end to end, so that every solution updates the envelope at once
+		self.grids: List[ndarray] = [array(grid, dtype = float64) for grid in grids]
+		self.offsets: List[int] = list()
+		size: int = 0
+		for grid in self.grids:
+			self.offsets.append(size)
+			size += len(grid)
+
+		self.count: int = 0             # the number of cases consumed
+		self.cases: List[str] = list()  # the names of the consumed cases that govern, or governed, some point
+		self.indices: Dict[str, int] = dict()  # the index of each of those names in self.cases
+		self.limit: int = 64  # the number of names self.cases is compacted at
+		self.maxima: ndarray = full((3, size), -inf)
+		self.minima: ndarray = full((3, size), inf)
+		self.maxCases: ndarray = full((3, size), -1, dtype = int64)  # the index in self.cases of the case that governs each maximum
+		self.minCases: ndarray = full((3, size), -1, dtype = int64)  # and each minimum
+
+	# this function builds an envelope that samples beams of the given lengths at evenly spaced points
+	@staticmethod
+	def evenlySpaced(lengths: List[float], samples: int = 101) -> Envelope:
+		return Envelope([linspace(0, length, samples) for length in lengths])
+
+	# this function updates the envelope with the stresses of a batch of cases, given with shape (cases, 3, points), the points being those of every grid
+	def update(self, names: List[str], stresses: ndarray):
+		for (name, values) in zip(names, stresses):
+			self.count += 1
+			greater: ndarray = values > self.maxima
+			smaller: ndarray = values < self.minima
+			if not greater.any() and not smaller.any():
+				continue
+
+			index: Union[int, None] = self.indices.get(name)
+			if index == None:
+				if len(self.cases) >= self.limit:
+					self.compact()
+
+				index = len(self.cases)
+				self.cases.append(name)
+				self.indices[name] = index
+
+			self.maxima[greater] = values[greater]
+			self.maxCases[greater] = index
+			self.minima[smaller] = values[smaller]
+			self.minCases[smaller] = index
+
+	# this function drops the names of the cases that no longer govern any point and renumbers the rest; the limit is then set to twice the names kept,
+	# so that compacting takes a time proportional to the names added since the last time
+	def compact(self):
+		referenced: ndarray = unique(concatenate((self.maxCases.ravel(), self.minCases.ravel())))
+		referenced = referenced[referenced >= 0]
+		remap: ndarray = full(len(self.cases) + 1, -1, dtype = int64)  # the last entry maps the -1 of the points no case reached to itself
+		remap[referenced] = range(len(referenced))
+
+		self.maxCases = remap[self.maxCases]
+		self.minCases = remap[self.minCases]
+		self.cases = [self.cases[c] for c in referenced]
+		self.indices = {name: c for (c, name) in enumerate(self.cases)}
+		self.limit = max(64, 2*len(self.cases))
+
+	# this function updates the envelope with a case's solution, whose unsolved beams leave the envelope as it was
+	def add(self, name: str, solution: Solution):
+		stresses: ndarray = full((1,) + self.maxima.shape, nan)
+		for (b, grid, offset) in zip(solution.beams, self.grids, self.offsets):
+			if b != None:
+				stresses[0, :, offset:offset + len(grid)] = b.stresses(grid)
+
+		self.update([name], stresses)
+
+	# this function updates the envelope with the combinations of a basis' load cases weighted by each row of a matrix with shape (combinations, cases);
+	# the cases' stresses are sampled on the grids once, and the combinations are then found a chunk at a time, as products by the weights
+	def addCombinations(self, basis: CaseBasis, names: List[str], weights: ndarray, chunk: int = 256):
+		sampled: ndarray = zeros((len(basis.cases), 3, self.maxima.shape[1]))
+		for (i, (breakpoints, grid)) in enumerate(zip(basis.breakpoints, self.grids)):
+			if breakpoints is None:
+				continue
+
+			segments: ndarray = clip(searchsorted(breakpoints, grid, side = 'right') - 1, 0, len(breakpoints) - 2)
+			rows: ndarray = basis.coefficients[:, :, basis.offsets[i] + segments]
+			sampled[:, :, self.offsets[i]:self.offsets[i] + len(grid)] = horner(rows, grid - breakpoints[segments])
+
+		weights = array(weights, dtype = float64, ndmin = 2)
+		flat: ndarray = sampled.reshape(len(basis.cases), prod(sampled.shape[1:]))
+		for start in range(0, len(weights), chunk):
+			stresses: ndarray = (weights[start:start + chunk] @ flat).reshape(-1, 3, self.maxima.shape[1])
+			self.update(names[start:start + chunk], stresses)
+
+	# this function returns the envelope along the i-th beam: its grid, the largest and smallest stresses, shaped (3, points),
+	# and the names of the cases that govern them, None where no case reached the beam
+	def beam(self, i: int) -> Tuple[ndarray, ndarray, ndarray, List[List[Union[str, None]]], List[List[Union[str, None]]]]:
+		points: slice = slice(self.offsets[i], self.offsets[i] + len(self.grids[i]))
+		return (
+			self.grids[i], self.maxima[:, points], self.minima[:, points],
+			[[self.cases[c] if c >= 0 else None for c in row] for row in self.maxCases[:, points]],
+			[[self.cases[c] if c >= 0 else None for c in row] for row in self.minCases[:, points]]
+		)
@@ -2,10 +2,13 @@ from __future__ import annotations
 from typing import Tuple
 from auxiliary.algebra import Vector3, Polynomial, integrate, psin, pcos, pcot
 
+DEFAULT_CASE: str = "default"  # the load case of the loads that are not given one
+
 # this class defines a concentrated force
 class Concentrated:
-	def __init__(self, magnitude: float):
+	def __init__(self, magnitude: float, case: str = DEFAULT_CASE):
 		self.magnitude: float = magnitude
+		self.case: str = case  # the load case the force belongs to, such as dead, live or wind loads
 
 	# this function returns the vector that represents the concentrated force, given its angle
 	def forceVector(self, angle: float) -> Vector3:
@@ -17,15 +20,14 @@ class Concentrated:
 
 # this class defines a distributed force
 class Distributed:
-	def __init__(self, length: float, distribution: Polynomial):
+	def __init__(self, length: float, distribution: Polynomial, case: str = DEFAULT_CASE):
 		self.length: float = length
 		self.distribution: Polynomial = Polynomial(distribution.coefficients.copy())
+		self.case: str = case
 
 	# this function returns the concentrated force mechanically equivalent to the distributed force and its point of application, relative to its 0
 	def equivalent(self) -> Tuple[Concentrated, float]:
-		p1: Polynomial = Polynomial(self.distribution.coefficients.copy())
-		p1.coefficients.insert(0, 0)
-		p1.degree = self.distribution.degree + 1
+		p1: Polynomial = Polynomial([0, 1])*self.distribution
 		integral: float = integrate(self.distribution, 0, self.length)
 		return (
 			Concentrated(integral),
@@ -34,12 +36,7 @@ class Distributed:
 
 	# this function finds the distributed force's parallel and perpendicular components applied on a beam at a given angle
 	def angledComponents(self, angle: float) -> Tuple[Distributed, Distributed]:
-		basePolynomial: Polynomial = Polynomial(self.distribution.coefficients.copy())
-		if self.distribution.degree < 1:
-			basePolynomial.coefficients.append(pcot(angle))
-			basePolynomial.degree = 1
-		else:
-			basePolynomial.coefficients[1] += pcot(angle)
+		basePolynomial: Polynomial = self.distribution + Polynomial([0, pcot(angle)])
 		return (
 			Distributed(self.length/psin(angle), pcos(angle)*basePolynomial),
 			Distributed(self.length/psin(angle), psin(angle)*basePolynomial)
@@ -47,5 +44,6 @@ class Distributed:
 
 # this class defines a moment or torque
 class Moment:
-	def __init__(self, magnitude : float):
+	def __init__(self, magnitude : float, case: str = DEFAULT_CASE):
 		self.magnitude: float = magnitude
+		self.case: str = case
@@ -0,0 +1,101 @@
+from __future__ import annotations
+from typing import List, Tuple, Dict, TYPE_CHECKING
+from dataclasses import dataclass
+from numpy import ndarray, array, zeros, empty, arange, interp, convolve, float64
+from auxiliary.algebra import Vector3, Matrix3x3, PiecewisePolynomial, horner
+from force import Concentrated
+from solution import Solution
+
+if TYPE_CHECKING:
+	from system import System
+
+# an influence line gives a response of the system, the stress at a section of a beam, for a unit load at each position along a path made of beams,
+# measured from the start of the path's first beam; as the system is isostatic, the response is linear in the load's position between the joints
+# and the section, where the shear stress jumps, so the line is interpolated from the solutions for a unit load at those points only
+
+UNIT_CASE: str = "unit load"  # the load case of the unit loads, which keeps them apart from the system's own loads
+
+# this class holds an influence line as the positions of its vertices along the path, sorted, and the response at each of them;
+# a position is listed twice where the response jumps, first with the response for the load just before it
+@dataclass(frozen = True)
+class InfluenceLine:
+	positions: ndarray
+	values: ndarray
+
+	# this function returns the response for a unit load at each position s along the path, which is zero off the path
+	def __call__(self, s: ndarray) -> ndarray:
+		return interp(s, self.positions, self.values, left = 0, right = 0)
+
+	# this function returns the largest and smallest response to a train of loads moving along the path, given as a list of pairs of the distance from
+	# each of its loads to its leading one and the load's magnitude; the leading load moves in steps of the given length, the whole train entering and
+	# leaving the path, and the responses at all steps are found at once by convolving the sampled line with the train's loads, rounded to the steps
+	def movingLoad(self, train: List[Tuple[float, float]], step: float) -> Tuple[float, float]:
+		samples: ndarray = self(arange(self.positions[0], self.positions[-1] + step/2, step))
+		loads: ndarray = zeros(int(round(max(d for (d, load) in train)/step)) + 1)
+		for (d, load) in train:
+			loads[int(round(d/step))] += load
+
+		responses: ndarray = convolve(samples, loads)
+		return (float(responses.max()), float(responses.min()))
+
+# this function returns the limit of a piecewise polynomial at x from its left, which differs from its value where it jumps at x
+def leftLimit(f: PiecewisePolynomial, x: float) -> float:
+	i: int = f.segment(x)
+	if i > 0 and f.breakpoints[i] == x:
+		i -= 1
+	return float(horner(f.coefficients[i], x - f.breakpoints[i]))
+
+# this function solves a system for a unit load at a position along its i-th beam alone, given its supports as found by System.assembleSupports;
+# the load is handed to the solve rather than applied on the beam, so the system is never modified
+def solveUnitLoad(system: System, supports: Tuple[Matrix3x3, list], i: int, position: float, angle: float) -> Solution:
+	load: List[Tuple[Concentrated, float, float]] = [(Concentrated(1, UNIT_CASE), position, angle)]
+	contributions: List[Vector3] = [Vector3(0, 0, 0)]*len(system.beams)
+	contributions[i] = system.loadContribution(i, UNIT_CASE, load)
+	return system.solveBeams(supports[0], contributions[i], supports[1], contributions, None, set(), UNIT_CASE, {i: load}).solution
+
+# this function returns the influence lines of a stress type, given by polyID, at each of the given sections, given as pairs of the index of
+# a beam and the position along it, for a unit load at the given angle moving along a path, given as the indices of its beams from start to end;
+# the solutions for the load at the path's joints are shared by every section, so each section adds a single solve
+def influenceLines(system: System, path: List[int], sections: List[Tuple[int, float]], polyID: int, angle: float = 90) -> List[InfluenceLine]:
+	supports: Tuple[Matrix3x3, list] = system.assembleSupports()
+
+	offsets: Dict[int, float] = dict()  # the position along the path where each of its beams starts
+	length: float = 0
+	for i in path:
+		offsets[i] = length
+		length += system.beams[i][0].length
+
+	# the unit load is placed at the start of the path and at the end of each of its beams
+	joints: List[Tuple[float, Solution]] = [(0.0, solveUnitLoad(system, supports, path[0], 0, angle))]
+	for i in path:
+		joints.append((offsets[i] + system.beams[i][0].length, solveUnitLoad(system, supports, i, system.beams[i][0].length, angle)))
+
+	# the response at every section for the load at each joint, evaluated for all the sections on each beam at once
+	responses: ndarray = empty((len(joints), len(sections)))
+	beams: Dict[int, List[int]] = dict()
+	for (k, (beam, x)) in enumerate(sections):
+		beams.setdefault(beam, list()).append(k)
+	for (j, (s, solution)) in enumerate(joints):
+		for (beam, ks) in beams.items():
+			responses[j, ks] = solution.beams[beam].stressMany(polyID, array([sections[k][1] for k in ks], dtype = float64))
+
+	lines: List[InfluenceLine] = list()
+	for (k, (beam, x)) in enumerate(sections):
+		vertices: List[Tuple[float, float]] = [(s, float(responses[j, k])) for (j, (s, solution)) in enumerate(joints)]
+
+		if beam in offsets:
+			# the load just before the section leaves it behind, as the stress right after the load does, and the load just after the section
+			# is ahead of it, as the stress right before the load is
+			s: float = offsets[beam] + x
+			f: PiecewisePolynomial = solveUnitLoad(system, supports, beam, x, angle).beams[beam].stressFunctions[polyID]
+			vertices = [v for v in vertices if v[0] < s] + [(s, f(x)), (s, leftLimit(f, x))] + [v for v in vertices if v[0] > s]
+
+		lines.append(InfluenceLine(array([v[0] for v in vertices], dtype = float64), array([v[1] for v in vertices], dtype = float64)))
+
+	return lines
+
+# this function returns the envelope of a stress type, given by polyID, at each of the given sections for a train of loads moving along a path,
+# as the largest and smallest stress at each section; the train is given as in InfluenceLine.movingLoad
+def movingLoadEnvelope(system: System, path: List[int], sections: List[Tuple[int, float]], polyID: int, train: List[Tuple[float, float]], step: float, angle: float = 90) -> Tuple[ndarray, ndarray]:
+	extremes: List[Tuple[float, float]] = [line.movingLoad(train, step) for line in influenceLines(system, path, sections, polyID, angle)]
+	return (array([e[0] for e in extremes], dtype = float64), array([e[1] for e in extremes], dtype = float64))
@@ -1,12 +1,13 @@
 from tkinter import *
 from ttkthemes import themed_tk as tk
-from typing import Deque, List, Tuple, Iterable, Iterator, Optional, Callable
+from typing import Deque, Dict, List, Tuple, Iterator, Optional, Callable
 from enum import IntEnum
 from dataclasses import dataclass, field
 from system import System
 from collections import deque, namedtuple
 from math import dist, degrees, atan2, copysign
 from auxiliary.algebra import psin, pcos, ptan, Vector3, Polynomial
+from auxiliary.spatial import SpatialIndex, SnapRegistry
 from functools import partial
 from beam import Beam
 from PIL import ImageTk, Image
@@ -38,6 +39,44 @@ sign = partial(copysign, 1)
 def trunc(a):
 	return round(round(a, 1), 1)
 
+DIAGRAM_SCALES : Tuple[float, float, float] = (0.3, 0.3, -0.03)  # the scales the normal, shear and bending diagrams are drawn at
+DIAGRAM_TOLERANCES : Tuple[float, float, float] = tuple(0.5 / (20 * abs(scale)) for scale in DIAGRAM_SCALES)  # the stresses that make up half a pixel at those scales
+
+# this class keeps the canvas items of the previews drawn while editing, identified by keys: each item is created the first time it is drawn
+# and is then only moved and reconfigured, and it is hidden rather than deleted when its preview goes away
+class PreviewLayer:
+
+	def __init__(self, canvas : Canvas):
+		self.canvas : Canvas = canvas
+		self.items : Dict[object, int] = dict()
+
+	# this function draws the item of a given key as a canvas item of the given kind, such as "line" or "text", at the given coordinates and with the given options;
+	# a reused item is raised to the top, as a new one would be, so that it is not hidden under the items created since
+	def draw(self, key : object, kind : str, coords : Tuple[float, ...], **options) -> int:
+		item : Optional[int] = self.items.get(key)
+
+		if item == None:
+			item = getattr(self.canvas, "create_" + kind)(*coords, **options)
+			self.items[key] = item
+		else:
+			self.canvas.coords(item, *coords)
+			self.canvas.itemconfigure(item, state = NORMAL, **options)
+			self.canvas.tag_raise(item)
+
+		return item
+
+	# this function hides the items of the given keys, which are shown again when drawn
+	def hide(self, *keys : object):
+		for key in keys:
+			if key in self.items:
+				self.canvas.itemconfigure(self.items[key], state = HIDDEN)
+
+	# this function deletes the items of the given keys from the canvas
+	def delete(self, *keys : object):
+		for key in keys:
+			if key in self.items:
+				self.canvas.delete(self.items.pop(key))
+
 class MainWidget:
 
 	def __init__(self, root):
@@ -45,30 +84,30 @@ class MainWidget:
 		self.drawing_area.pack(fill = BOTH, expand = True, side = TOP)
 
 		self.system : System = System()
+		self.structureEdited : bool = True  # tells whether beams or supports changed since the last solve, which otherwise
+		self.editedBeams : List[Beam] = list()  # only needs to account for the loads of the edited beams
 		self.insertionMode : InsertionMode = InsertionMode.BEAM
 		self.actions : Deque[Action] = deque()
 
 		self.isMousePressed : bool = False
 		self.currentMousePosition : Point = Point(0, 0)
 		self.firstWaypoint : Point = Point(0, 0)
-		self.snapPoints : List[Point] = list()
+		self.snapPoints : SnapRegistry = SnapRegistry(radius = 40)  # the beams' ends, along with the beams that end at each of them, identified as in ownedDomain
 		self.snapIndicators : List = list()
 
 		self.isShiftPressed : bool = False
 		self.isCtrlPressed : bool = False
 		self.inserting : bool = False
 
-		self.beamPreview = None
+		self.preview : PreviewLayer = PreviewLayer(self.drawing_area)  # holds the beam preview, the highlight of the beam under the cursor and the distributed loads' preview
+		self.redrawPending : bool = False  # tells whether the previews will be redrawn once Tk is idle, which coalesces bursts of motion events into one redraw
+
 		self.labelPreview = None
-		self.arcPreview = None
-		self.anglePreview = None
 		self.forcePreview = None
-		self.startLabelPreview = None
 
 		self.insertionText = None
-		self.arrowIndicator = None
 
-		self.ownedDomain : List[List[int]] = [[0 for y in range(768)] for x in range(1360)]
+		self.ownedDomain : SpatialIndex = SpatialIndex(radius = 15)  # finds the beam under a point, identified by its index in the system plus one
 
 		self.drawing_area.bind("<ButtonPress-1>", self.leftMousePressed)
 		self.drawing_area.bind("<ButtonRelease-1>", self.leftMouseReleased)
@@ -83,17 +122,7 @@ class MainWidget:
 			self.insertionText = self.drawing_area.create_text(20, 20, font = "Helvetica", text = "Modo de Inserção: Barra", anchor = W)
 
 	def drawBeam(self, start : Point, end : Point, beamAngle : float, size : float, event = None) -> Tuple[object, object]:
-		if self.beamPreview != None:
-			event.widget.delete(self.beamPreview)
-
-		if self.arcPreview != None:
-			event.widget.delete(self.arcPreview)
-
-		if self.labelPreview != None:
-			event.widget.delete(self.labelPreview)
-
-		if self.anglePreview != None:
-			event.widget.delete(self.anglePreview)
+		self.preview.hide("beam", "arc", "angle", "length")
 
 		beam = event.widget.create_line((start, end), smooth = True, width = 5, fill="#404040")
 
@@ -103,34 +132,22 @@ class MainWidget:
 		return (beam, length)
 
 	def drawBeamPreview(self, start : Point, end : Point, beamAngle : float, size: float, event = None):
-		if self.beamPreview != None:
-			event.widget.delete(self.beamPreview)
-
-		if self.arcPreview != None:
-			event.widget.delete(self.arcPreview)
-
-		if self.labelPreview != None:
-			event.widget.delete(self.labelPreview)
-
-		if self.anglePreview != None:
-			event.widget.delete(self.anglePreview)
-
-		self.beamPreview = event.widget.create_line((start, end), smooth = True, dash = (10, 10))
-		self.arcPreview = event.widget.create_arc(start.x - 20, start.y - 20, start.x + 20, start.y + 20, start = 0, extent = beamAngle)
-		self.anglePreview = event.widget.create_text(start.x + 40, start.y + (20 * sign(beamAngle)) if beamAngle != 0 else start.y + 20, font = "Helvetica", text = "{0:.1f}º".format(beamAngle))
+		self.preview.draw("beam", "line", (start.x, start.y, end.x, end.y), smooth = True, dash = (10, 10))
+		self.preview.draw("arc", "arc", (start.x - 20, start.y - 20, start.x + 20, start.y + 20), start = 0, extent = beamAngle)
+		self.preview.draw("angle", "text", (start.x + 40, start.y + (20 * sign(beamAngle)) if beamAngle != 0 else start.y + 20), font = "Helvetica", text = "{0:.1f}º".format(beamAngle))
 
 		textAngle = beamAngle if 0 <= beamAngle < 90 else beamAngle - 180 if beamAngle > 90 else 360 + beamAngle if - 90 < beamAngle < 0 else beamAngle + 180
-		self.labelPreview = event.widget.create_text((start.x + end.x) / 2 - 20 * psin(beamAngle), (start.y + end.y) / 2 - 20 * pcos(beamAngle), font = "Helvetica", text = "{0:1.1f} m".format(size), angle = textAngle)
+		self.preview.draw("length", "text", ((start.x + end.x) / 2 - 20 * psin(beamAngle), (start.y + end.y) / 2 - 20 * pcos(beamAngle)), font = "Helvetica", text = "{0:1.1f} m".format(size), angle = textAngle)
 
 	def beamParameters(self, start : Point, end : Point) -> Tuple[Point, Point, float, float]:
 		angle : float = 0
 		nearSnapPoint : bool = False
 
 		if self.isShiftPressed:
-			for point in self.snapPoints:
-				if dist(point, end) <= 40 and point != start:
-					nearSnapPoint = True
-					end = point
+			point : Optional[Point] = self.snapPoints.nearest(end, exclude = start)
+			if point != None:
+				nearSnapPoint = True
+				end = Point(*point)
 
 		angle = atan2(start.y - end.y, end.x - start.x)
 		angle = degrees(angle)
@@ -144,7 +161,10 @@ class MainWidget:
 			snap = snaps[transform.index(min(transform))]
 			angle = snap if angle > 0 else - snap
 
-		end = Point(end.x, start.y - (end.x  - start.x) * ptan(angle)) if abs(angle) != 90 else Point(start.x, end.y)
+		# a snapped end is kept as it is, so that it lands exactly on the joint
+		if not nearSnapPoint:
+			end = Point(end.x, start.y - (end.x  - start.x) * ptan(angle)) if abs(angle) != 90 else Point(start.x, end.y)
+
 		length : float = round(dist(end, start) / 10, 1)
 
 		return (start, end, length, angle)
@@ -153,11 +173,10 @@ class MainWidget:
 		self.isMousePressed = True
 		self.firstWaypoint = Point(trunc(event.x), trunc(event. y))
 
-		if not len(self.snapPoints) == 0:
-			for point in self.snapPoints:
-				if dist(point, self.firstWaypoint) <= 40 and self.isShiftPressed:
-					self.firstWaypoint = point
-					break
+		if self.isShiftPressed:
+			point : Optional[Point] = self.snapPoints.nearest(self.firstWaypoint)
+			if point != None:
+				self.firstWaypoint = Point(*point)
 
 	def leftMouseReleased(self, event = None):
 		self.isMousePressed = False
@@ -169,44 +188,18 @@ class MainWidget:
 			params = self.beamParameters(self.firstWaypoint, self.currentMousePosition)
 			(beam, length) = self.drawBeam(params[0], params[1], params[3], params[2], event)
 			addedBeam : Beam = Beam(params[2])
-
-			if len(self.system.beams) > 0:
-				for beamItem in self.system.beams:
-					if Point(beamItem[1].x, beamItem[1].y) == params[0]:
-						beamItem[0].start[1].append(addedBeam)
-						addedBeam.start[1].append(beamItem[0])
-					elif Point(beamItem[1].x, beamItem[1].y) == params[1]:
-						beamItem[0].start[1].append(addedBeam)
-						addedBeam.end[1].append(beamItem[0])
-					elif Point(beamItem[3].x, beamItem[3].y) == params[0]:
-						beamItem[0].end[1].append(addedBeam)
-						addedBeam.start[1].append(beamItem[0])
-					elif Point(beamItem[3].x, beamItem[3].y) == params[1]:
-						beamItem[0].end[1].append(addedBeam)
-						addedBeam.end[1].append(beamItem[0])
+			self.structureEdited = True
 
 			self.actions.append(Action(related = [beam, length, params[0], params[1]], type = ActionType.ADD_BEAM))
-			self.system.beams.append((addedBeam, Vector3(params[0].x, params[0].y, 0), params[3], Vector3(params[1].x, params[1].y, 0)))
-
-			if not params[0] in self.snapPoints:
-				self.snapPoints.append(params[0])
-
-			if not params[1] in self.snapPoints:
-				self.snapPoints.append(params[1])
+			self.system.addBeam(addedBeam, Vector3(params[0].x, params[0].y, 0), params[3], Vector3(params[1].x, params[1].y, 0))
 
 			barID = len(self.system.beams)
-
-			rangeX : Iterable = range(int(params[0].x), int(params[1].x) + 1) if params[1].x > params[0].x else range(int(params[1].x), int(params[0].x) + 1) if params[1].x < params[0].x else [params[0].x for o in range(int(abs(params[1].y - params[0].y)) + 1)]
-			rangeY : Iterable = range(int(params[0].y), int(params[1].y) + 1) if params[1].y > params[0].y else range(int(params[1].y), int(params[0].y) + 1) if params[1].y < params[0].y else [params[0].y for o in range(int(abs(params[1].x - params[0].x)) + 1)]
-
-			for (x, y) in zip(rangeX, rangeY):
-				for w in range(-15, 15):
-					for h in range(-15, 15):
-						if self.ownedDomain[x + w][y + h] == 0:
-							self.ownedDomain[x + w][y + h] = barID
+			self.ownedDomain.insert(barID, params[0], params[1])
+			self.snapPoints.add(barID, params[0])
+			self.snapPoints.add(barID, params[1])
 
 		elif self.insertionMode == InsertionMode.FORCE:
-			owner : int = self.ownedDomain[self.currentMousePosition.x][self.currentMousePosition.y]
+			owner : int = self.ownedDomain.query(self.currentMousePosition)
 
 			if owner != 0:
 				self.inserting = True
@@ -219,19 +212,17 @@ class MainWidget:
 				self.supportWindow = SupportWidget(support, self, "Parâmetros: Força", self.currentMousePosition.x + 350, self.currentMousePosition.y, InsertionMode.FORCE, force = Point(beam[1].x, beam[1].y), beamAngle = beam[2], beamID = owner)
 
 		elif self.insertionMode == InsertionMode.DISTRIBUTED:
-			owner : int = self.ownedDomain[self.currentMousePosition.x][self.currentMousePosition.y]
+			owner : int = self.ownedDomain.query(self.currentMousePosition)
 
 			if owner != 0:
 				self.inserting = True
 				beam = self.system.beams[owner - 1]
 
-				self.forcePreview = list()
-
 				support = Toplevel(self.drawing_area)
 				self.supportWindow = SupportWidget(support, self, "Parâmetros: Carga Distribuída", self.currentMousePosition.x + 350, self.currentMousePosition.y, InsertionMode.DISTRIBUTED, force = Point(beam[1].x, beam[1].y), beamAngle = beam[2], beamID = owner)
 
 		elif self.insertionMode == InsertionMode.MOMENT:
-			owner : int = self.ownedDomain[self.currentMousePosition.x][self.currentMousePosition.y]
+			owner : int = self.ownedDomain.query(self.currentMousePosition)
 
 			if owner != 0:
 				self.inserting = True
@@ -241,7 +232,7 @@ class MainWidget:
 				self.supportWindow = SupportWidget(support, self, "Parâmetros: Momento", self.currentMousePosition.x + 350, self.currentMousePosition.y, InsertionMode.MOMENT, force = Point(beam[1].x, beam[1].y), beamAngle = beam[2], beamID = owner, beamEnd = Point(beam[3].x, beam[3].y))
 
 		elif self.insertionMode == InsertionMode.SUPPORT:
-			owner : int = self.ownedDomain[self.currentMousePosition.x][self.currentMousePosition.y]
+			owner : int = self.ownedDomain.query(self.currentMousePosition)
 
 			if owner != 0:
 				self.inserting = True
@@ -253,25 +244,24 @@ class MainWidget:
 	def mouseMotion(self, event = None):
 		self.currentMousePosition = Point(trunc(event.x), trunc(event.y))
 
-		if self.ownedDomain[self.currentMousePosition.x][self.currentMousePosition.y] != 0 and self.insertionMode != InsertionMode.BEAM:
-			if self.arrowIndicator != None:
-				self.drawing_area.delete(self.arrowIndicator)
-
-			owner : int = self.ownedDomain[self.currentMousePosition.x][self.currentMousePosition.y]
-			ownerInstance = self.system.beams[owner - 1]
+		if not self.redrawPending:
+			self.redrawPending = True
+			self.drawing_area.after_idle(self.redrawMotion)
 
-			start = (ownerInstance[1].x, ownerInstance[1].y)
-			end = (ownerInstance[3].x, ownerInstance[3].y)
+	def redrawMotion(self):
+		self.redrawPending = False
+		owner : int = self.ownedDomain.query(self.currentMousePosition)
 
-			self.arrowIndicator = self.drawing_area.create_line((start, end), fill = "blue", width = 4)
+		if owner != 0 and self.insertionMode != InsertionMode.BEAM:
+			ownerInstance = self.system.beams[owner - 1]
+			self.preview.draw("owner", "line", (ownerInstance[1].x, ownerInstance[1].y, ownerInstance[3].x, ownerInstance[3].y), fill = "blue", width = 4)
 		else:
-			if self.arrowIndicator != None:
-				self.drawing_area.delete(self.arrowIndicator)
+			self.preview.hide("owner")
 
 		if self.isMousePressed:
 			if self.insertionMode == InsertionMode.BEAM:
 				params = self.beamParameters(self.firstWaypoint, self.currentMousePosition)
-				self.drawBeamPreview(params[0], params[1], params[3], params[2], event)
+				self.drawBeamPreview(params[0], params[1], params[3], params[2])
 
 	def keyboardPress(self, event = None):
 		if event.keysym in ("Shift_L", "Shift_R"):
@@ -299,15 +289,20 @@ class MainWidget:
 		elif event.char == "4":
 			self.insertionMode = InsertionMode.SUPPORT
 		elif event.char == "s":
-			polynomials = self.system.solveSystem()
+			solution = self.system.solveSystem() if self.structureEdited else self.system.solveIncremental(self.editedBeams)
+			self.structureEdited = False
+			self.editedBeams.clear()
 
 			supportNormal = Toplevel(self.drawing_area)
 			supportShear = Toplevel(self.drawing_area)
 			supportBending = Toplevel(self.drawing_area)
 
-			normal = ResultWidget(supportNormal, "Normal", self.system.beams.copy(), polynomials, 0)
-			shear = ResultWidget(supportShear, "Cortante", self.system.beams.copy(), polynomials, 1)
-			bending = ResultWidget(supportBending, "Momento", self.system.beams.copy(), polynomials, 2)
+			# the three diagrams are drawn from a single sampling pass, which the solution keeps
+			samples = solution.sample(DIAGRAM_TOLERANCES)
+
+			normal = ResultWidget(supportNormal, "Normal", self.system.beams.copy(), samples, 0)
+			shear = ResultWidget(supportShear, "Cortante", self.system.beams.copy(), samples, 1)
+			bending = ResultWidget(supportBending, "Momento", self.system.beams.copy(), samples, 2)
 
 		if self.insertionText != None:
 			self.drawing_area.delete(self.insertionText)
@@ -320,35 +315,22 @@ class MainWidget:
 		if len(self.actions) > 0:
 			lastAction : Action = self.actions.pop()
 
+			if lastAction.type in (ActionType.ADD_BEAM, ActionType.ADD_SUPPORT):
+				self.structureEdited = True
+			else:
+				self.editedBeams.append(self.system.beams[lastAction.related[2] - 1][0])
+
 			if lastAction.type == ActionType.ADD_BEAM:
 				beam = lastAction.related[0]
 				label = lastAction.related[1]
 
-				rangeX : Iterable = range(int(lastAction.related[2].x), int(lastAction.related[3].x) + 1) if lastAction.related[3].x > lastAction.related[2].x else range(int(lastAction.related[3].x), int(lastAction.related[2].x) + 1) if lastAction.related[3].x < lastAction.related[2].x else [lastAction.related[2].x for o in range(int(abs(lastAction.related[3].y - lastAction.related[2].y)) + 1)]
-				rangeY : Iterable = range(int(lastAction.related[2].y), int(lastAction.related[3].y) + 1) if lastAction.related[3].y > lastAction.related[2].y else range(int(lastAction.related[3].y), int(lastAction.related[2].y) + 1) if lastAction.related[3].y < lastAction.related[2].y else [lastAction.related[2].y for o in range(int(abs(lastAction.related[3].x - lastAction.related[2].x)) + 1)]
-
-				for (x, y) in zip(rangeX, rangeY):
-					for w in range(-15, 15):
-						for h in range(-15, 15):
-							self.ownedDomain[trunc(x + w)][trunc(y + h)] = 0
+				self.ownedDomain.remove(len(self.system.beams))
+				self.snapPoints.remove(len(self.system.beams), lastAction.related[2])
+				self.snapPoints.remove(len(self.system.beams), lastAction.related[3])
 
 				self.drawing_area.delete(beam)
 				self.drawing_area.delete(label)
-				self.system.beams.pop()
-				self.snapPoints.clear()
-
-				for beamItem in self.system.beams:
-					if not beamItem[0] in self.snapPoints:
-						self.snapPoints.append(Point(beamItem[1].x, beamItem[1].y))
-
-					if not beamItem[3] in self.snapPoints:
-						self.snapPoints.append(Point(beamItem[3].x, beamItem[3].y))
-
-					if beam in beamItem[0].start[1]:
-						beamItem[0].start[1].remove(beam)
-
-					elif beam in beamItem[0].end[1]:
-						beamItem[0].end[1].remove(beam)
+				self.system.removeBeam(self.system.beams[-1][0])
 
 				del beam
 
@@ -611,6 +593,7 @@ class SupportWidget:
 		tipY : float = self.master_force.y - (pos * psin(self.beamAngle) * 10)
 
 		self.master_window.system.beams[self.beamID - 1][0].concentratedList.append((Concentrated(length), pos, force_angle + self.beamAngle))
+		self.master_window.editedBeams.append(self.master_window.system.beams[self.beamID - 1][0])
 		self.master_window.drawing_area.delete(self.master_window.forcePreview)
 		self.master_window.drawing_area.delete(self.master_window.labelPreview)
 
@@ -691,12 +674,6 @@ class SupportWidget:
 
 			scale = 1 if 0 <= uniformLoad <= 10 else 0.1 if 10 < uniformLoad < 100 else 0.01 if 100 <= uniformLoad < 1000 else 0.001
 
-			if len(self.master_window.forcePreview) != 0:
-				for force in self.master_window.forcePreview:
-					self.master_window.drawing_area.delete(force)
-				self.master_window.forcePreview.clear()
-				self.master_window.drawing_area.delete(self.master_window.labelPreview)
-
 			tipX : float = self.master_force.x + (start_pos * pcos(self.beamAngle) * 10)
 			tipY : float = self.master_force.y - (start_pos * psin(self.beamAngle) * 10)
 
@@ -704,11 +681,12 @@ class SupportWidget:
 			tipY0 : float = tipY
 
 			for i in range(11):
-				self.master_window.forcePreview.append(self.master_window.drawing_area.create_line(tipX - 20 * uniformLoad * scale * pcos(force_angle), tipY - 20 * uniformLoad * scale * psin(force_angle), tipX, tipY, arrow = LAST, width = 4.0, activefill = "blue", smooth = True))
+				self.master_window.preview.draw(("distributed", i), "line", (tipX - 20 * uniformLoad * scale * pcos(force_angle), tipY - 20 * uniformLoad * scale * psin(force_angle), tipX, tipY), arrow = LAST, width = 4.0, activefill = "blue", smooth = True)
 				tipX = tipX + (end_pos - start_pos) * pcos(self.beamAngle)
 				tipY = tipY - (end_pos - start_pos) * psin(self.beamAngle)
 
-			self.master_window.labelPreview = self.master_window.drawing_area.create_text((tipX + tipX0) / 2 - 40 * pcos(force_angle) if force_angle <= 180 else (tipX + tipX0) / 2, (tipY + tipY0) // 2 - 30 * (uniformLoad), font = "Helvetica", text = f"{uniformLoad} kN/m")
+			self.master_window.preview.draw("distributedLabel", "text", ((tipX + tipX0) / 2 - 40 * pcos(force_angle) if force_angle <= 180 else (tipX + tipX0) / 2, (tipY + tipY0) // 2 - 30 * (uniformLoad)), font = "Helvetica", text = f"{uniformLoad} kN/m")
+			self.master_window.preview.hide("distributedStartLabel")
 
 			self.lastRadio = 0
 
@@ -718,15 +696,6 @@ class SupportWidget:
 
 			scale = 1
 
-			if self.master_window.startLabelPreview != None and self.master_window.startLabelPreview != 0:
-				self.master_window.drawing_area.delete(self.master_window.startLabelPreview)
-
-			if len(self.master_window.forcePreview) != 0:
-				for force in self.master_window.forcePreview:
-					self.master_window.drawing_area.delete(force)
-				self.master_window.forcePreview.clear()
-				self.master_window.drawing_area.delete(self.master_window.labelPreview)
-
 			tipX : float = self.master_force.x + (start_pos * pcos(self.beamAngle) * 10)
 			tipY : float = self.master_force.y - (start_pos * psin(self.beamAngle) * 10)
 			load : int = startLoad
@@ -735,15 +704,17 @@ class SupportWidget:
 			tipY0 : float = tipY
 
 			for i in range(11):
-				self.master_window.forcePreview.append(self.master_window.drawing_area.create_line(tipX - 20 * load * scale * pcos(force_angle), tipY - 20 * load * scale * psin(force_angle), tipX, tipY, arrow = LAST, width = 2.0, activefill = "blue", smooth = True))
+				self.master_window.preview.draw(("distributed", i), "line", (tipX - 20 * load * scale * pcos(force_angle), tipY - 20 * load * scale * psin(force_angle), tipX, tipY), arrow = LAST, width = 2.0, activefill = "blue", smooth = True)
 				tipX = tipX + (end_pos - start_pos) * pcos(self.beamAngle)
 				tipY = tipY - (end_pos - start_pos) * psin(self.beamAngle)
 				load = load + (endLoad - startLoad) / 10
 
 			if startLoad != 0:
-				self.master_window.startLabelPreview = self.master_window.drawing_area.create_text(tipX0, tipY0 - 5 - 25 * startLoad, font = "Helvetica", text = f"{startLoad} kN/m")
+				self.master_window.preview.draw("distributedStartLabel", "text", (tipX0, tipY0 - 5 - 25 * startLoad), font = "Helvetica", text = f"{startLoad} kN/m")
+			else:
+				self.master_window.preview.hide("distributedStartLabel")
 
-			self.master_window.labelPreview = self.master_window.drawing_area.create_text(tipX, tipY - 5 - 25 * endLoad, font = "Helvetica", text = f"{endLoad} kN/m")
+			self.master_window.preview.draw("distributedLabel", "text", (tipX, tipY - 5 - 25 * endLoad), font = "Helvetica", text = f"{endLoad} kN/m")
 
 			self.lastRadio = 1
 
@@ -758,12 +729,6 @@ class SupportWidget:
 
 			scale = 1 if 0 <= uniformLoad <= 10 else 0.1 if 10 < uniformLoad < 100 else 0.01 if 100 <= uniformLoad < 1000 else 0.001
 
-			if len(self.master_window.forcePreview) != 0:
-				for force in self.master_window.forcePreview:
-					self.master_window.drawing_area.delete(force)
-				self.master_window.forcePreview.clear()
-				self.master_window.drawing_area.delete(self.master_window.labelPreview)
-
 			tipX : float = self.master_force.x + (start_pos * pcos(self.beamAngle) * 10)
 			tipY : float = self.master_force.y - (start_pos * psin(self.beamAngle) * 10)
 
@@ -780,6 +745,7 @@ class SupportWidget:
 			label = self.master_window.drawing_area.create_text((tipX + tipX0) / 2 - 40 * pcos(force_angle) if force_angle <= 180 else (tipX + tipX0) / 2, (tipY + tipY0) // 2 - 30 * (uniformLoad), font = "Helvetica", text = f"{uniformLoad} kN/m")
 
 			self.master_window.system.beams[self.beamID - 1][0].distributedList.append((Distributed(end_pos - start_pos, Polynomial([uniformLoad])), start_pos, force_angle + self.beamAngle))
+			self.master_window.editedBeams.append(self.master_window.system.beams[self.beamID - 1][0])
 			self.master_window.actions.append(Action(related = (forces, label, self.beamID, False, 0), type = ActionType.ADD_DISTRIBUTED))
 
 		if radioOption == 1:
@@ -788,15 +754,6 @@ class SupportWidget:
 
 			scale = 1
 
-			if len(self.master_window.forcePreview) != 0:
-				for force in self.master_window.forcePreview:
-						self.master_window.drawing_area.delete(force)
-				self.master_window.forcePreview.clear()
-				self.master_window.drawing_area.delete(self.master_window.labelPreview)
-
-			if self.master_window.startLabelPreview != None and self.master_window.startLabelPreview != 0:
-				self.master_window.drawing_area.delete(self.master_window.startLabelPreview)
-
 			tipX : float = self.master_force.x + (start_pos * pcos(self.beamAngle) * 10)
 			tipY : float = self.master_force.y - (start_pos * psin(self.beamAngle) * 10)
 			load : int = startLoad
@@ -820,13 +777,10 @@ class SupportWidget:
 			label = self.master_window.drawing_area.create_text(tipX, tipY - 5 - 25 * endLoad, font = "Helvetica", text = f"{endLoad} kN/m")
 
 			self.master_window.system.beams[self.beamID - 1][0].distributedList.append((Distributed(end_pos - start_pos, Polynomial([startLoad, (endLoad - startLoad) / (end_pos - start_pos)])), start_pos, force_angle + self.beamAngle))
+			self.master_window.editedBeams.append(self.master_window.system.beams[self.beamID - 1][0])
 			self.master_window.actions.append(Action(related = (forces, label, self.beamID, startLoad != 0, startLabel), type = ActionType.ADD_DISTRIBUTED))
 
-		for force in self.master_window.forcePreview:
-			self.master_window.drawing_area.delete(force)
-
-		self.master_window.forcePreview.clear()
-		self.master_window.drawing_area.delete(self.master_window.labelPreview)
+		self.master_window.preview.delete(*[("distributed", i) for i in range(11)], "distributedLabel", "distributedStartLabel")
 
 		self.master_window.inserting = False
 		self.master.destroy()
@@ -851,6 +805,7 @@ class SupportWidget:
 		tipY : float = ((self.master_force.y + self.beamEnd.y) // 2)
 
 		self.master_window.system.beams[self.beamID - 1][0].moment = Moment(magnitude)
+		self.master_window.editedBeams.append(self.master_window.system.beams[self.beamID - 1][0])
 		self.master_window.drawing_area.delete(self.master_window.forcePreview)
 		self.master_window.drawing_area.delete(self.master_window.labelPreview)
 
@@ -935,12 +890,13 @@ class SupportWidget:
 		support = self.master_window.drawing_area.create_image(tipX, tipY, image = supportAsset)
 
 		self.master_window.actions.append(Action(related = (support, supportAsset, self.beamID, position), type = ActionType.ADD_SUPPORT))
+		self.master_window.structureEdited = True
 		self.master_window.inserting = False
 		self.master.destroy()
 
 class ResultWidget:
 
-	def __init__(self, master, name: str, beams, polynomials, polyID):
+	def __init__(self, master, name: str, beams, samples, polyID):
 		self.master = master
 		self.master.geometry(f"1360x768")
 		self.master.title(name)
@@ -950,28 +906,24 @@ class ResultWidget:
 
 		for (i, beam) in enumerate(beams):
 
-			if polynomials[i] != None:
+			if samples[i] != None:
 				start = Point(beam[1].x, beam[1].y)
 				end = Point(beam[3].x, beam[3].y)
 
 				self.canvas.create_line((start, end), smooth = True, width = 5, fill="#404040")
 
-				stressFunctions = polynomials[i]
-
-				length = beam[0].length
 				angle = beam[2]
 
-				tipX = start.x
-				tipY = start.y
-
-				scale = -0.03 if polyID == 2 else 0.3
+				scale = DIAGRAM_SCALES[polyID]
 
-				for j in range(0, 100):
-					fun = stressFunctions(polyID, j * length / 100)
+				# each piece of the diagram is a single polygon, closed along the beam, sampled finely enough to stray from the diagram by half a pixel at most
+				for (xs, stresses) in samples[i].pieces():
+					values = stresses[polyID]
+					pointsX = start.x + 10 * xs * pcos(angle) + 20 * values * scale * pcos(90 + angle)
+					pointsY = start.y - 10 * xs * psin(angle) - 20 * values * scale * psin(90 + angle)
+					outline = [(start.x + 10 * xs[0] * pcos(angle), start.y - 10 * xs[0] * psin(angle))] + list(zip(pointsX.tolist(), pointsY.tolist())) + [(start.x + 10 * xs[-1] * pcos(angle), start.y - 10 * xs[-1] * psin(angle))]
 
-					self.canvas.create_line(tipX, tipY, tipX + 20 * fun * scale * pcos(90 + angle), tipY - 20 * fun * scale * psin(90 + angle))
-					tipX += 1 / 10 * length * pcos(angle)
-					tipY -= 1 / 10 * length * psin(angle)
+					self.canvas.create_polygon(outline, outline = "black", fill = "black", stipple = "gray25")
 
 if __name__ == "__main__":
 	root = tk.ThemedTk()
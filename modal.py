@@ -0,0 +1,121 @@
+from typing import List, Tuple, Dict
+from dataclasses import dataclass
+from numpy import ndarray, array, zeros, ones, repeat, tile, arange, linspace, concatenate, column_stack, einsum, argsort, sqrt, pi, setdiff1d, float64
+from scipy.sparse import coo_matrix, csr_matrix, csc_matrix
+from scipy.sparse.linalg import eigsh
+from scipy.linalg import eigh
+from beam import Beam
+from auxiliary.algebra import Vector3
+from stiffness import Frame, elementStiffness
+
+# the modal analysis models the system as the stiffness method does, each beam being split into elements of equal length so that its own
+# vibration is taken into account, and pairs the global stiffness matrix with the consistent mass matrix, found from the same shape functions;
+# the supports' constraints are removed from both through a change of basis, and the lowest natural frequencies are then the smallest eigenvalues
+# of the sparse generalized problem K x = w^2 M x, which are found by the Lanczos method in shift-invert mode around zero
+
+# this function returns the consistent mass matrices of elements with the given lengths and masses per unit length, in their local coordinates
+def elementMass(lengths: ndarray, masses: ndarray) -> ndarray:
+	m: ndarray = zeros((len(lengths), 6, 6))
+	a: ndarray = masses*lengths/6
+	b: ndarray = masses*lengths/420
+	l: ndarray = lengths
+
+	m[:, 0, 0] = m[:, 3, 3] = 2*a
+	m[:, 0, 3] = m[:, 3, 0] = a
+	m[:, 1, 1] = m[:, 4, 4] = 156*b
+	m[:, 1, 4] = m[:, 4, 1] = 54*b
+	m[:, 1, 2] = m[:, 2, 1] = 22*b*l
+	m[:, 4, 5] = m[:, 5, 4] = -22*b*l
+	m[:, 1, 5] = m[:, 5, 1] = -13*b*l
+	m[:, 2, 4] = m[:, 4, 2] = 13*b*l
+	m[:, 2, 2] = m[:, 5, 5] = 4*b*l**2
+	m[:, 2, 5] = m[:, 5, 2] = -3*b*l**2
+	return m
+
+# this class holds the lowest natural modes of a system: their angular frequencies, in ascending order, and their shapes, normalized to a unit modal mass,
+# as the x and y displacements and rotation, on a y-up plane, at evenly spaced points along each beam, with shape (modes, beams, points, 3)
+@dataclass(frozen = True)
+class Modes:
+	angularFrequencies: ndarray
+	points: ndarray  # the positions of the points along each beam, with shape (beams, points)
+	shapes: ndarray
+
+	# this function returns the natural frequencies, in cycles per unit of time
+	def frequencies(self) -> ndarray:
+		return self.angularFrequencies/(2*pi)
+
+	# this function returns the natural periods
+	def periods(self) -> ndarray:
+		return 2*pi/self.angularFrequencies
+
+# this function finds the lowest natural modes of a system, given its beams and the joints at their start and end, each beam being split into the given
+# number of elements; fewer modes are returned when the constrained system has fewer degrees of freedom
+def naturalModes(beams: List[Tuple[Beam, Vector3, float, Vector3]], beamJoints: List[Tuple[int, int]], count: int = 6, divisions: int = 8) -> Modes:
+	frame: Frame = Frame(beams, beamJoints)
+	m: int = len(beams)
+
+	# the inner points of the beams are numbered as nodes after the joints, and each element spans two consecutive points of its beam
+	ends: ndarray = array([[frame.nodes[joint] for joint in joints] for joints in beamJoints], dtype = int).reshape(-1, 2)
+	inner: ndarray = len(frame.nodes) + arange(m*(divisions - 1)).reshape(m, divisions - 1)
+	chains: ndarray = column_stack((ends[:, 0], inner, ends[:, 1]))
+	pairs: ndarray = column_stack((chains[:, :-1].ravel(), chains[:, 1:].ravel()))
+	dofs: ndarray = (3*pairs[:, :, None] + arange(3)).reshape(-1, 6)
+	n: int = 3*(len(frame.nodes) + inner.size)
+
+	lengths: ndarray = repeat(array([b[0].length for b in beams], dtype = float64)/divisions, divisions)
+	transforms: ndarray = repeat(frame.transforms, divisions, axis = 0)
+	stiffness: ndarray = elementStiffness(lengths, repeat(array([b[0].EA for b in beams], dtype = float64), divisions), repeat(array([b[0].EI for b in beams], dtype = float64), divisions))
+	mass: ndarray = elementMass(lengths, repeat(array([b[0].mass for b in beams], dtype = float64), divisions))
+
+	rows: ndarray = repeat(dofs, 6, axis = 1).ravel()
+	cols: ndarray = tile(dofs, (1, 6)).ravel()
+	(K, M) = (coo_matrix((einsum('mji,mjk,mkl->mil', transforms, k, transforms).ravel(), (rows, cols)), shape = (n, n)).tocsr() for k in (stiffness, mass))
+
+	# the basis of the displacements the supports allow: every free degree of freedom is kept as it is, a joint whose displacement is constrained
+	# along one direction keeps the one normal to it and a joint whose displacement is constrained along two directions keeps none
+	directions: Dict[int, List[Tuple[float, float, float]]] = dict()
+	for (dof, direction, i, side) in frame.constraints:
+		directions.setdefault(dof, list()).append(direction)
+
+	constrained: List[int] = list()
+	extraRows: List[int] = list()
+	extraValues: List[float] = list()
+	for (dof, constraints) in directions.items():
+		translations: List[Tuple[float, float, float]] = [d for d in constraints if d[2] == 0]
+		if len(translations) > 0:
+			constrained += [dof, dof + 1]
+		if len(translations) == 1:
+			(x, y) = translations[0][:2]
+			norm: float = (x**2 + y**2)**0.5
+			extraRows += [dof, dof + 1]
+			extraValues += [-y/norm, x/norm]
+		if len(translations) < len(constraints):
+			constrained.append(dof + 2)
+
+	free: ndarray = setdiff1d(arange(n), constrained)
+	extraCols: ndarray = len(free) + arange(len(extraRows))//2
+	size: int = len(free) + len(extraRows)//2
+	T: csr_matrix = coo_matrix((concatenate((ones(len(free)), extraValues)), (concatenate((free, extraRows)), concatenate((arange(len(free)), extraCols)))), shape = (n, size)).tocsr()
+	(K, M) = (csc_matrix(T.T @ A @ T) for A in (K, M))
+
+	count = min(count, size)
+	if count >= size - 1:
+		# the sparse solver only finds fewer eigenpairs than the problem's size, so small problems are solved whole
+		(values, vectors) = eigh(K.toarray(), M.toarray())
+	else:
+		try:
+			(values, vectors) = eigsh(K, count, M, sigma = 0, which = 'LM')
+		except RuntimeError:
+			raise Exception('System is hypostatic!')
+
+	# a mechanism's rigid motions have no stiffness, so they would be modes of zero frequency
+	order: ndarray = argsort(values)[:count]
+	if len(order) > 0 and values[order[0]] <= 1e-9*(K.diagonal()/M.diagonal()).max():
+		raise Exception('System is hypostatic!')
+
+	displacements: ndarray = (T @ vectors[:, order]).T
+	return Modes(
+		sqrt(values[order]),
+		array([linspace(0, b[0].length, divisions + 1) for b in beams], dtype = float64).reshape(m, divisions + 1),
+		displacements[:, 3*chains[:, :, None] + arange(3)]
+	)
@@ -0,0 +1,126 @@
+from typing import Dict, List, Tuple, Any, Union, Optional
+from json import load
+from math import atan2, degrees, hypot
+from numpy import ndarray, linspace, full, concatenate, cumsum, split
+from auxiliary.algebra import Vector3, Polynomial
+from beam import Beam
+from force import Concentrated, Distributed, Moment, DEFAULT_CASE
+from support import Support
+from system import System
+from solution import Solution, DiagramSamples
+from deflection import Deflections
+
+# model files describe a system as a list of beams, given in meters on a y-up plane:
+# {"beams": [{"start": [0, 0], "end": [10, 0],
+#             "startSupport": {"type": "PINNED"}, "endSupport": {"type": "SIMPLE", "angle": 90},
+#             "concentrated": [{"magnitude": 10, "position": 5, "angle": 90, "case": "live"}],
+#             "distributed": [{"length": 4, "distribution": [2, 0.5], "position": 1, "angle": 90}],
+#             "moment": 0, "EA": 1e6, "EI": 2e4, "mass": 0.03925}]}
+# the rigidities are optional and only used by the stiffness method, as is the mass per unit length by the modal analysis; the loads' cases are optional too, defaulting to "default",
+# and the moment's case is given as "momentCase"
+
+STRESS_NAMES: List[str] = ["normal", "shear", "bending"]
+CURVE_NAMES: List[str] = ["displacement", "deflection", "rotation"]
+
+# this function reads a model file
+def loadModel(path: str) -> Dict[str, Any]:
+	with open(path) as file:
+		return load(file)
+
+# this function converts a point in meters on a y-up plane to the canvas coordinates the system works with
+def canvasPoint(point: List[float]) -> Vector3:
+	return Vector3(point[0]*10, -point[1]*10, 0)
+
+# this function builds the system described by a model
+def buildSystem(model: Dict[str, Any]) -> System:
+	system: System = System()
+
+	for description in model["beams"]:
+		(x0, y0) = description["start"]
+		(x1, y1) = description["end"]
+		beam: Beam = Beam(hypot(x1 - x0, y1 - y0), description.get("EA", 1e6), description.get("EI", 2e4), description.get("mass", 0.03925))
+
+		if "startSupport" in description:
+			beam.start = (Support(description["startSupport"]["type"], description["startSupport"].get("angle", 0)), beam.start[1])
+
+		if "endSupport" in description:
+			beam.end = (Support(description["endSupport"]["type"], description["endSupport"].get("angle", 0)), beam.end[1])
+
+		for force in description.get("concentrated", []):
+			beam.concentratedList.append((Concentrated(force["magnitude"], force.get("case", DEFAULT_CASE)), force["position"], force["angle"]))
+
+		for force in description.get("distributed", []):
+			beam.distributedList.append((Distributed(force["length"], Polynomial(force["distribution"]), force.get("case", DEFAULT_CASE)), force["position"], force["angle"]))
+
+		if description.get("moment", 0) != 0:
+			beam.moment = Moment(description["moment"], description.get("momentCase", DEFAULT_CASE))
+
+		system.addBeam(beam, canvasPoint(description["start"]), round(degrees(atan2(y1 - y0, x1 - x0)), 6), canvasPoint(description["end"]))
+
+	return system
+
+# this function solves the system described by a model and returns its supports' reactions
+# and its normal, shear and bending diagrams sampled at evenly spaced points along each beam or, given a tolerance, piece by piece
+# at points close enough for lines between them to stray from each diagram by at most the tolerance, a jump showing as two samples at the same point;
+# the method is either "equilibrium", which only solves isostatic systems, or "stiffness", which also solves hyperstatic ones and samples
+# the beams' axial displacement, deflection and rotation as well; the curves are sampled at the diagrams' points when no tolerance is given and,
+# otherwise, on points of their own, listed as curveX: piece by piece against the curve tolerance when one is given, so that the deflection,
+# which bends more than the diagrams it comes from, holds to its own tolerance, or else at evenly spaced points
+def solveModel(model: Dict[str, Any], samples: int = 101, method: str = "equilibrium", tolerance: Optional[float] = None, curveTolerance: Optional[float] = None) -> Dict[str, Any]:
+	system: System = buildSystem(model)
+	solution: Solution
+	deflections: Union[Deflections, None] = None
+	if method == "stiffness":
+		(solution, deflections) = system.solveDeflections()
+	else:
+		solution = system.solveSystem()
+
+	# the three stresses of each beam are sampled together, through the solution's shared sampling pass when a tolerance is given
+	points: List[Union[ndarray, None]]
+	stresses: List[Union[ndarray, None]]
+	if tolerance != None:
+		sampled: Tuple[Union[DiagramSamples, None], ...] = solution.sample((tolerance, tolerance, tolerance))
+		points = [s.points if s != None else None for s in sampled]
+		stresses = [s.stresses if s != None else None for s in sampled]
+	else:
+		points = [linspace(0, beamItem[0].length, samples) if b != None else None for (beamItem, b) in zip(system.beams, solution.beams)]
+		stresses = [b.stresses(xs) if b != None else None for (xs, b) in zip(points, solution.beams)]
+
+	curvePoints: List[ndarray] = points
+	curves: Union[List[ndarray], None] = None
+	if deflections != None and tolerance != None and curveTolerance != None:
+		curveSamples: List[DiagramSamples] = [deflections.sample(i, (curveTolerance, curveTolerance, curveTolerance)) for i in range(len(system.beams))]
+		curvePoints = [c.points for c in curveSamples]
+		curves = [c.stresses for c in curveSamples]
+	elif deflections != None:
+		if tolerance != None:
+			curvePoints = [linspace(0, beamItem[0].length, samples) for beamItem in system.beams]
+
+		# the elastic curves are evaluated at every beam's points at once, as the stiffness method solves every beam
+		values: ndarray = deflections.evaluate(concatenate([full(len(xs), i) for (i, xs) in enumerate(curvePoints)]), concatenate(curvePoints))
+		curves = split(values, cumsum([len(xs) for xs in curvePoints])[:-1], axis = 1)
+
+	reactions: List[Dict[str, Any]] = list()
+	diagrams: List[Dict[str, Any]] = list()
+
+	for (i, beamItem) in enumerate(system.beams):
+		for (name, reaction) in zip(("start", "end"), solution.reactions[i]):
+			if reaction != None:
+				reactions.append({"beam": i, "end": name, "x": float(reaction[0]), "y": float(reaction[1]), "z": float(reaction[2])})
+
+		if solution.beams[i] != None:
+			diagram: Dict[str, Any] = {"beam": i, "x": points[i].tolist()}
+
+			for (polyID, name) in enumerate(STRESS_NAMES):
+				diagram[name] = stresses[i][polyID].tolist()
+
+			if curves != None:
+				if curvePoints is not points:
+					diagram["curveX"] = curvePoints[i].tolist()
+
+				for (k, name) in enumerate(CURVE_NAMES):
+					diagram[name] = curves[i][k].tolist()
+
+			diagrams.append(diagram)
+
+	return {"reactions": reactions, "diagrams": diagrams}
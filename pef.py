@@ -0,0 +1,82 @@
+from typing import List, Optional
+from argparse import ArgumentParser, Namespace
+from glob import glob, has_magic
+from json import dump
+from os import makedirs, path
+from collections import Counter
+import sys
+from batch import solveFiles
+
+# this module is the headless entry point of the project, which solves model files without the graphical interface:
+# python -m pef solve models/*.json -o results/
+
+# this function expands the given file patterns, keeping the paths that are not patterns as they are
+def expandPaths(patterns: List[str]) -> List[str]:
+	paths: List[str] = list()
+
+	for pattern in patterns:
+		paths += sorted(glob(pattern)) if has_magic(pattern) else [pattern]
+
+	return paths
+
+# this function names the result file of each model after the model's file; the models whose files share a name are told apart by the part of their paths
+# below the directory they share, and any name still taken is numbered, so that no result overwrites another
+def outputNames(modelPaths: List[str]) -> List[str]:
+	stems: List[str] = [path.splitext(path.basename(p))[0] for p in modelPaths]
+	counts: Counter = Counter(stems)
+	shared: List[str] = [path.dirname(path.abspath(p)) for (p, stem) in zip(modelPaths, stems) if counts[stem] > 1]
+	root: str = path.commonpath(shared) if len(shared) > 0 else ""
+
+	names: List[str] = list()
+	used: set = set()
+	for (modelPath, stem) in zip(modelPaths, stems):
+		name: str = stem if counts[stem] == 1 else path.splitext(path.relpath(path.abspath(modelPath), root))[0].replace(path.sep, "_")
+		candidate: str = name
+		k: int = 2
+		while candidate in used:
+			candidate = f"{name}-{k}"
+			k += 1
+
+		used.add(candidate)
+		names.append(candidate + ".json")
+
+	return names
+
+# this function solves every given model and writes its results to the output directory, returning the number of failed models
+def solveCommand(arguments: Namespace) -> int:
+	makedirs(arguments.output, exist_ok = True)
+	failures: int = 0
+
+	modelPaths: List[str] = expandPaths(arguments.models)
+	results = solveFiles(modelPaths, arguments.workers, arguments.chunksize, arguments.samples, arguments.method, arguments.tolerance, arguments.curve_tolerance)
+
+	for (modelPath, name, result) in zip(modelPaths, outputNames(modelPaths), results):
+		if "error" in result:
+			print(f"{modelPath}: {result['error']}", file = sys.stderr)
+			failures += 1
+			continue
+
+		with open(path.join(arguments.output, name), "w") as file:
+			dump(result, file)
+
+	return failures
+
+def main(argv: Optional[List[str]] = None) -> int:
+	parser: ArgumentParser = ArgumentParser(prog = "pef", description = "PEF3208 - Análise de Estruturas 2D")
+	commands = parser.add_subparsers(dest = "command", required = True)
+
+	solve: ArgumentParser = commands.add_parser("solve", help = "solve model files and write their reactions and diagrams")
+	solve.add_argument("models", nargs = "+", help = "model files or patterns")
+	solve.add_argument("-o", "--output", default = "results", help = "directory where the results are written")
+	solve.add_argument("-n", "--samples", type = int, default = 101, help = "number of points sampled along each beam")
+	solve.add_argument("-t", "--tolerance", type = float, default = None, help = "sample each piece of the diagrams only as finely as needed to stay within this tolerance, instead of at evenly spaced points")
+	solve.add_argument("--curve-tolerance", type = float, default = None, help = "with a tolerance, sample each piece of the elastic curves against this tolerance, instead of at evenly spaced points")
+	solve.add_argument("-j", "--workers", type = int, default = None, help = "number of worker processes, defaults to the number of processors")
+	solve.add_argument("-m", "--method", choices = ["equilibrium", "stiffness"], default = "equilibrium", help = "solve by the equilibrium equations, which only solve isostatic systems, or by the stiffness method")
+	solve.add_argument("-c", "--chunksize", type = int, default = 16, help = "number of models sent to a worker at a time")
+
+	arguments: Namespace = parser.parse_args(argv)
+	return 1 if solveCommand(arguments) > 0 else 0
+
+if __name__ == "__main__":
+	sys.exit(main())
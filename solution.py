@@ -0,0 +1,140 @@
+from __future__ import annotations
+from typing import List, Tuple, Dict, Union
+from dataclasses import dataclass, field
+from numpy import ndarray, array, zeros, full, concatenate, repeat, diff, cumsum, where, isfinite, lexsort, searchsorted, arange, clip, ceil, sqrt, union1d, array_equal, float64, nan
+from auxiliary.algebra import PiecewisePolynomial, horner, realRoots, derivativeCoefficients
+
+Reaction = Tuple[float, float, float]  # the reaction's force components and moment, in that order
+
+# this class holds the stress functions found for a beam; like every solution object, it is immutable
+@dataclass(frozen = True)
+class BeamSolution:
+	stressFunctions: Tuple[PiecewisePolynomial, PiecewisePolynomial, PiecewisePolynomial]  # normal, shear and bending stress, in that order
+
+	def __post_init__(self):
+		for f in self.stressFunctions:
+			f.breakpoints.flags.writeable = False
+			f.coefficients.flags.writeable = False
+
+	# this function returns the stress at a given point x on the beam
+	def stress(self, polyID: int, x: float) -> float:  # the polyID corresponds to the normal, shear and bending stress types, respectively
+		return self.stressFunctions[polyID](x)
+
+	# this function returns the stress at every point of the array xs on the beam, evaluating only the requested diagram
+	def stressMany(self, polyID: int, xs: ndarray) -> ndarray:
+		f: PiecewisePolynomial = self.stressFunctions[polyID]
+		(segments, local) = f.locate(xs)
+		return horner(f.coefficients[segments], local)
+
+	# this function returns the normal, shear and bending stresses at every point of the array xs on the beam, stacked in that order;
+	# each point's segment is found through a binary search over the breakpoints and its polynomials are evaluated with Horner's rule
+	def stresses(self, xs: ndarray) -> ndarray:
+		(segments, local) = self.stressFunctions[0].locate(xs)
+		return array([horner(f.coefficients[segments], local) for f in self.stressFunctions])
+
+	# this function samples the normal, shear and bending stresses piece by piece on points shared by the three, given the tolerance of each, as samplePieces does
+	def sample(self, tolerances: Tuple[float, float, float], limit: int = 64) -> DiagramSamples:
+		breakpoints: ndarray = union1d(union1d(self.stressFunctions[0].breakpoints, self.stressFunctions[1].breakpoints), self.stressFunctions[2].breakpoints)
+		functions: List[PiecewisePolynomial] = [f if array_equal(f.breakpoints, breakpoints) else f.refine(breakpoints) for f in self.stressFunctions]
+
+		size: int = max(f.coefficients.shape[1] for f in functions)
+		coefs: ndarray = zeros((3, len(breakpoints) - 1, size))
+		for (polyID, f) in enumerate(functions):
+			coefs[polyID, :, :f.coefficients.shape[1]] = f.coefficients
+
+		return samplePieces(breakpoints, coefs, tolerances, limit)
+
+# this function samples piecewise polynomials that share their breakpoints, given their pieces' coefficients stacked with shape (curves, pieces, degree + 1),
+# on points shared by every curve, so that the lines between the samples stray from every curve by at most its tolerance: over a span h a line is off
+# by at most h^2/8 times the largest second derivative, which is bounded through the piece's coefficients, so straight pieces take only their ends
+# and curved ones take more points the more they bend, up to the limit; every piece of every curve is then evaluated at once
+def samplePieces(breakpoints: ndarray, coefs: ndarray, tolerances: Tuple[float, ...], limit: int = 64) -> DiagramSamples:
+	h: ndarray = diff(breakpoints)
+	p: ndarray = arange(2, coefs.shape[2])
+	curvature: ndarray = (abs(coefs[:, :, 2:])*p*(p - 1)*h[:, None]**(p - 2)).sum(axis = 2)
+	counts: ndarray = clip(ceil(h*sqrt(curvature/(8*array(tolerances, dtype = float64)[:, None])).max(axis = 0)), 1, limit).astype(int)
+
+	offsets: ndarray = cumsum(concatenate(([0], counts + 1)))
+	pieces: ndarray = repeat(arange(len(h)), counts + 1)
+	local: ndarray = (arange(offsets[-1]) - offsets[pieces])/counts[pieces]*h[pieces]
+	return DiagramSamples(breakpoints[pieces] + local, horner(coefs[:, pieces], local), offsets)
+
+# this class holds a beam's normal, shear and bending stresses, or its elastic curves, sampled piece by piece on points shared by every curve, both ends
+# of each piece included, so that a jump between pieces shows as two samples at the same point
+@dataclass(frozen = True)
+class DiagramSamples:
+	points: ndarray    # the points along the beam
+	stresses: ndarray  # the normal, shear and bending stresses at them, or the values of whichever curves were sampled, with shape (curves, points)
+	offsets: ndarray   # the index of each piece's first point, followed by the number of points
+
+	# this function returns each piece's points and the stresses at them
+	def pieces(self) -> List[Tuple[ndarray, ndarray]]:
+		return [(self.points[a:b], self.stresses[:, a:b]) for (a, b) in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist())]
+
+# this class holds the largest and smallest normal, shear and bending stress on each beam and where along the beam they are reached,
+# each with shape (beams, 3), which are nan for the beams left unsolved
+@dataclass(frozen = True)
+class Extremes:
+	maxima: ndarray
+	maxPositions: ndarray
+	minima: ndarray
+	minPositions: ndarray
+
+# this class holds the result of solving a system, paired one to one with the system's beams; the result itself never changes, but the solution
+# carries a cache, sampled, of the samples found by sample for each set of tolerances, which only ever grows with values derived from the result
+# and takes no part in comparing or printing solutions
+@dataclass(frozen = True)
+class Solution:
+	reactions: Tuple[Tuple[Union[Reaction, None], Union[Reaction, None]], ...]  # the reactions of the supports at each beam's start and end
+	beams: Tuple[Union[BeamSolution, None], ...]
+	order: Tuple[int, ...] = ()  # the indices of the beams in the order they were solved
+	sampled: Dict[Tuple[float, float, float], Tuple[Union[DiagramSamples, None], ...]] = field(default_factory = dict, compare = False, repr = False)
+
+	# this function samples the stresses of every beam as BeamSolution.sample does, keeping the samples for each set of tolerances,
+	# so that every window or export showing the solution shares a single sampling pass
+	def sample(self, tolerances: Tuple[float, float, float]) -> Tuple[Union[DiagramSamples, None], ...]:
+		key: Tuple[float, float, float] = tuple(float(t) for t in tolerances)
+		if not key in self.sampled:
+			self.sampled[key] = tuple(b.sample(key) if b != None else None for b in self.beams)
+		return self.sampled[key]
+
+	# this function finds the exact extremes of every stress on every beam: a piece's extremes lie at its ends, which also covers the jumps between pieces,
+	# or where its derivative vanishes, and the roots of the derivatives of every piece of every beam are found at once, as in auxiliary.algebra.realRoots
+	def extremes(self) -> Extremes:
+		result: List[ndarray] = [full((len(self.beams), 3), nan) for i in range(4)]
+		solved: List[int] = [i for (i, b) in enumerate(self.beams) if b != None]
+		if len(solved) == 0:
+			return Extremes(*result)
+
+		for polyID in range(3):
+			functions: List[PiecewisePolynomial] = [self.beams[i].stressFunctions[polyID] for i in solved]
+			size: int = max(f.coefficients.shape[1] for f in functions)
+			coefs: ndarray = concatenate([concatenate((f.coefficients, zeros((len(f), size - f.coefficients.shape[1]))), axis = 1) for f in functions])
+			starts: ndarray = concatenate([f.breakpoints[:-1] for f in functions])
+			lengths: ndarray = concatenate([diff(f.breakpoints) for f in functions])
+			beams: ndarray = repeat(array(solved), [len(f) for f in functions])
+
+			# the candidates of each piece, relative to its start, are its ends and the roots of its derivative inside it
+			roots: ndarray = realRoots(derivativeCoefficients(coefs)) if size > 2 else zeros((len(coefs), 0))
+			roots = where((roots > 0) & (roots < lengths[:, None]), roots, nan)
+			local: ndarray = concatenate((zeros((len(coefs), 1)), lengths[:, None], roots), axis = 1)
+
+			values: ndarray = horner(coefs[:, None, :], local)
+			valid: ndarray = isfinite(local)
+			(values, positions, owners) = (values[valid], (starts[:, None] + local)[valid], repeat(beams[:, None], local.shape[1], axis = 1)[valid])
+
+			# sorting the candidates by beam and then by value puts each beam's smallest and largest values at the ends of its run
+			order: ndarray = lexsort((values, owners))
+			first: ndarray = searchsorted(owners[order], solved, side = 'left')
+			last: ndarray = searchsorted(owners[order], solved, side = 'right') - 1
+			for (k, picks) in ((0, last), (2, first)):
+				result[k][solved, polyID] = values[order[picks]]
+				result[k + 1][solved, polyID] = positions[order[picks]]
+
+		return Extremes(*result)
+
+# this class holds the result of solving a system as a truss, paired one to one with the system's beams, which are its members
+@dataclass(frozen = True)
+class TrussSolution:
+	reactions: Tuple[Tuple[Union[Reaction, None], Union[Reaction, None]], ...]  # the reactions of the supports at each member's start and end
+	forces: Tuple[float, ...]                                                     # the axial force in each member, positive when it is pulled
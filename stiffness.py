@@ -0,0 +1,198 @@
+from typing import List, Tuple, Dict, Union
+from warnings import catch_warnings, simplefilter
+from numpy import ndarray, array, zeros, ones, repeat, tile, concatenate, einsum, isfinite, add, float64
+from numpy.polynomial.legendre import leggauss
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.linalg import spsolve, MatrixRankWarning
+from auxiliary.algebra import Vector3, psin, pcos
+from beam import Beam
+from support import Support
+from solution import Solution, BeamSolution
+
+# the direct stiffness method models the system as a plane frame: each beam is an Euler-Bernoulli element whose ends are rigidly connected at the
+# joints of the system's joint graph, each joint has three degrees of freedom (its x and y displacements and its counterclockwise rotation, on a y-up plane)
+# and each support constrains the displacements along its reaction vector; unlike the equilibrium solve, any number of supports is accepted
+
+# this function returns the stiffness matrices of elements with the given lengths and axial and flexural rigidities, in their local coordinates
+def elementStiffness(lengths: ndarray, EA: ndarray, EI: ndarray) -> ndarray:
+	k: ndarray = zeros((len(lengths), 6, 6))
+	a: ndarray = EA/lengths
+	b: ndarray = 12*EI/lengths**3
+	c: ndarray = 6*EI/lengths**2
+	d: ndarray = 2*EI/lengths
+
+	k[:, 0, 0] = k[:, 3, 3] = a
+	k[:, 0, 3] = k[:, 3, 0] = -a
+	k[:, 1, 1] = k[:, 4, 4] = b
+	k[:, 1, 4] = k[:, 4, 1] = -b
+	k[:, 1, 2] = k[:, 2, 1] = k[:, 1, 5] = k[:, 5, 1] = c
+	k[:, 2, 4] = k[:, 4, 2] = k[:, 4, 5] = k[:, 5, 4] = -c
+	k[:, 2, 2] = k[:, 5, 5] = 2*d
+	k[:, 2, 5] = k[:, 5, 2] = d
+	return k
+
+# this function returns the matrices that take the displacements of elements at the given angles from global to local coordinates
+def elementTransforms(angles: ndarray) -> ndarray:
+	t: ndarray = zeros((len(angles), 6, 6))
+	c: ndarray = array([pcos(angle) for angle in angles], dtype = float64)
+	s: ndarray = array([psin(angle) for angle in angles], dtype = float64)
+
+	for i in (0, 3):
+		t[:, i, i] = t[:, i + 1, i + 1] = c
+		t[:, i, i + 1] = s
+		t[:, i + 1, i] = -s
+		t[:, i + 2, i + 2] = 1
+	return t
+
+# this function returns the shape functions of an element of length l at the points x along it, one row per local degree of freedom
+def shapeFunctions(x: ndarray, l: float) -> ndarray:
+	xi: ndarray = x/l
+	return array([1 - xi, 1 - 3*xi**2 + 2*xi**3, l*(xi - 2*xi**2 + xi**3), xi, 3*xi**2 - 2*xi**3, l*(xi**3 - xi**2)])
+
+# this function returns the derivatives of the shape functions of an element of length l at the points x along it
+def shapeSlopes(x: ndarray, l: float) -> ndarray:
+	xi: ndarray = x/l
+	return array([-ones(xi.shape)/l, 6*(xi**2 - xi)/l, 1 - 4*xi + 3*xi**2, ones(xi.shape)/l, 6*(xi - xi**2)/l, 3*xi**2 - 2*xi])
+
+# this function returns the nodal forces equivalent to a beam's loads, in the beam's local coordinates; the loads are taken as in Beam.solve,
+# with angles relative to the beam, and the beam's moment, whose position is not recorded, is applied at its midspan
+def equivalentLoads(beam: Beam) -> ndarray:
+	f: ndarray = zeros(6)
+	axial: ndarray = array([1, 0, 0, 1, 0, 0], dtype = float64)
+
+	for (force, position, angle) in beam.concentratedList:
+		v: Vector3 = force.forceVector(angle)
+		f += shapeFunctions(array([position]), beam.length)[:, 0]*(axial*v.x + (1 - axial)*v.y)
+
+	for (force, position, angle) in beam.distributedList:
+		# a Gauss-Legendre rule with this many points integrates the shape functions times the distribution exactly
+		(points, weights) = leggauss(force.distribution.degree//2 + 3)
+		s: ndarray = (points + 1)*force.length/2
+		q: ndarray = force.distribution(s)*weights*force.length/2
+		f += shapeFunctions(position + s, beam.length) @ q * (axial*pcos(angle) - (1 - axial)*psin(angle))
+
+	if beam.moment != None:
+		f += shapeSlopes(array([beam.length/2]), beam.length)[:, 0]*(1 - axial)*beam.moment.magnitude
+
+	return f
+
+# this function returns the directions, in global coordinates, along which a support constrains the displacements of the joint it is at
+def supportConstraints(support: Support) -> List[Tuple[float, float, float]]:
+	r: Vector3 = support.reaction
+	constraints: List[Tuple[float, float, float]] = [(1, 0, 0), (0, 1, 0)] if r.x == 1 and r.y == 1 else [(r.x, r.y, 0)]
+	if r.z != 0:
+		constraints.append((0, 0, 1))
+	return constraints
+
+# this class is the stiffness model of a system's beams, built from their lengths, angles, rigidities and loads and the joint graph connecting them
+class Frame:
+	def __init__(self, beams: List[Tuple[Beam, Vector3, float, Vector3]], beamJoints: List[Tuple[int, int]]):
+		self.beams: List[Tuple[Beam, Vector3, float, Vector3]] = beams
+
+		# each joint the beams meet at is numbered as a node, whose degrees of freedom are 3*node, 3*node + 1 and 3*node + 2
+		self.nodes: Dict[int, int] = dict()
+		for joints in beamJoints:
+			for joint in joints:
+				self.nodes.setdefault(joint, len(self.nodes))
+
+		self.dofs: ndarray = array([[3*self.nodes[joint] + d for joint in joints for d in range(3)] for joints in beamJoints], dtype = int).reshape(-1, 6)
+		self.stiffness: ndarray = elementStiffness(
+			array([b[0].length for b in beams], dtype = float64),
+			array([b[0].EA for b in beams], dtype = float64),
+			array([b[0].EI for b in beams], dtype = float64)
+		)
+		self.transforms: ndarray = elementTransforms([b[2] for b in beams])
+		self.loads: ndarray = array([equivalentLoads(b[0]) for b in beams], dtype = float64).reshape(-1, 6)
+
+		# these members list the constraints imposed by the supports: the degrees of freedom and directions they constrain,
+		# along with the index of the beam each support is attached to and the end it is attached at, 0 for the start and 1 for the end
+		self.constraints: List[Tuple[int, Tuple[float, float, float], int, int]] = list()
+		constrained: Dict[int, int] = dict()
+		for (i, (beam, start, angle, end)) in enumerate(beams):
+			for (side, support) in enumerate((beam.start[0], beam.end[0])):
+				if support == None:
+					continue
+
+				node: int = self.nodes[beamJoints[i][side]]
+				if node in constrained:
+					raise Exception('Joint has more than one support!')
+
+				constrained[node] = i
+				for direction in supportConstraints(support):
+					self.constraints.append((3*node, direction, i, side))
+
+	# this function returns the number of degrees of freedom of the frame
+	def size(self) -> int:
+		return 3*len(self.nodes)
+
+	# this function assembles the global stiffness matrix in the CSR format, summing each element's matrix into the rows and columns of its degrees of freedom
+	def globalStiffness(self) -> csr_matrix:
+		k: ndarray = einsum('mji,mjk,mkl->mil', self.transforms, self.stiffness, self.transforms)
+		rows: ndarray = repeat(self.dofs, 6, axis = 1)
+		cols: ndarray = tile(self.dofs, (1, 6))
+		return coo_matrix((k.ravel(), (rows.ravel(), cols.ravel())), shape = (self.size(), self.size())).tocsr()
+
+	# this function assembles the global load vector
+	def globalLoads(self) -> ndarray:
+		f: ndarray = zeros(self.size())
+		add.at(f, self.dofs, einsum('mji,mj->mi', self.transforms, self.loads))
+		return f
+
+	# this function finds the joints' displacements and the magnitudes of the supports' reactions along the directions they constrain;
+	# the constraints are enforced by Lagrange multipliers, which border the stiffness matrix, and the bordered system is solved by a sparse LU factorization
+	def solveDisplacements(self) -> Tuple[ndarray, ndarray]:
+		n: int = self.size()
+		k: csr_matrix = self.globalStiffness()
+
+		rows: List[int] = list()
+		cols: List[int] = list()
+		values: List[float] = list()
+		for (r, (dof, direction, i, side)) in enumerate(self.constraints):
+			for d in range(3):
+				if direction[d] != 0:
+					rows += [n + r, dof + d]
+					cols += [dof + d, n + r]
+					values += [direction[d], direction[d]]
+
+		size: int = n + len(self.constraints)
+		k = k.tocoo()
+		bordered: csr_matrix = coo_matrix((concatenate((k.data, values)), (concatenate((k.row, rows)), concatenate((k.col, cols)))), shape = (size, size)).tocsr()
+		rhs: ndarray = concatenate((self.globalLoads(), zeros(len(self.constraints))))
+
+		with catch_warnings():
+			simplefilter('ignore', MatrixRankWarning)
+			x: ndarray = spsolve(bordered.tocsc(), rhs)
+
+		if not isfinite(x).all():
+			raise Exception('System is hypostatic!')
+
+		return (x[:n], -x[n:])
+
+	# this function returns the forces and moments the joints apply on each element's ends, in the element's local coordinates
+	def endForces(self, displacements: ndarray) -> ndarray:
+		local: ndarray = einsum('mij,mj->mi', self.transforms, displacements[self.dofs])
+		return einsum('mij,mj->mi', self.stiffness, local) - self.loads
+
+	# this function solves the frame and finds the beams' stress functions from the forces at their starts
+	def solve(self) -> Solution:
+		return self.solution(*self.solveDisplacements())
+
+	# this function finds the beams' stress functions and the supports' reactions from the joints' displacements and the reactions' magnitudes
+	def solution(self, displacements: ndarray, magnitudes: ndarray) -> Solution:
+		forces: ndarray = self.endForces(displacements)
+
+		reactions: List[List[Union[Vector3, None]]] = [[None, None] for beam in self.beams]
+		for ((dof, direction, i, side), magnitude) in zip(self.constraints, magnitudes.tolist()):
+			if reactions[i][side] == None:
+				reactions[i][side] = Vector3(0, 0, 0)
+			reactions[i][side] += Vector3(*direction)*magnitude
+
+		solution: List[BeamSolution] = list()
+		for (i, (beam, start, angle, end)) in enumerate(self.beams):
+			solution.append(beam.solve(Vector3(*forces[i, :3].tolist()), angle, False, reactions[i])[1])
+
+		return Solution(
+			tuple(tuple((r.x, r.y, r.z) if r != None else None for r in ends) for ends in reactions),
+			tuple(solution),
+			tuple(range(len(self.beams)))
+		)
@@ -1,53 +1,319 @@
-from typing import List, Tuple, Callable, Union
-from auxiliary.algebra import Vector3, Polynomial, Matrix3x3, solve, rotate
+from __future__ import annotations
+from typing import List, Tuple, Dict, Set, Iterable, Union
+from dataclasses import dataclass
+from collections import OrderedDict
+from math import isclose
+from hashlib import blake2b
+from numpy import ndarray, array, float64
+from auxiliary.algebra import Vector3, Polynomial, Matrix3x3, solveBatch, rotate
 from beam import Beam
 from force import Concentrated, Distributed, Moment
 from support import Support
+from solution import Solution, BeamSolution, TrussSolution
+from stiffness import Frame
+from deflection import Deflections
+from modal import Modes, naturalModes
+from continuous import solveContinuous
+from truss import solveTruss
+from cases import CaseBasis
+from influence import InfluenceLine, influenceLines, movingLoadEnvelope
+
+# this class holds what a solve leaves behind for an incremental solve to reuse; it is never modified once built
+@dataclass(frozen = True)
+class SolveState:
+	coefs: Matrix3x3                                    # the coefficient matrix of the system's equilibrium equations
+	b: Vector3                                          # their right hand side
+	supports: List[Tuple[Vector3, Vector3, int, int]]
+	contributions: List[Vector3]                        # each beam's contribution to the right hand side
+	reactions: List[List[Union[Vector3, None]]]         # the reactions of the supports at each beam's start and end
+	inputs: List[Union[Tuple[Vector3, bool], None]]     # the reaction vector and the direction each beam was solved with
+	outputs: List[Union[Vector3, None]]                 # the reaction vector each beam's solve returned
+	solution: Solution
+	case: Union[str, None] = None                       # the load case that was solved, or None when every load was
+	supportSignature: str = ""                          # the signature of the supports coefs and supports were built for, as given by System.supportSignature
 
 # this class defines the system in which the mechanical forces interact with the beams
 class System:
-	def __init__(self):
+	def __init__(self, cacheSize: int = 32):
 		# this member lists the beams in the system
 		self.beams: List[Tuple[Beam, Vector3, float, Vector3]] = list()  # the tuple vectors are the beam's start and end position, respectively, with respect to the
 		                                                                 # center of the coordinate system, while the float is its angle with respect to the x axis
 
-	# this function calculates the supports' reaction vectors, uses them to calculate the beams' stress functions
-	# and returns a list paired one to one with the self.beams's beams which contains the function that returns the beam's .stress function
-	def solveSystem(self) -> List[Callable[[int, float], float]]:
-		coefs: Matrix3x3 = Matrix3x3([[0, 0, 0], [0, 0, 0], [0, 0, 0]])
+		# these members hold the least recently used cache of solve states, which hold the solutions, keyed by the structural hash of the system they were found for;
+		# any change to the beams, their loads or their supports changes the hash, so a stale solution is never returned
+		self.solutionCache: OrderedDict[str, SolveState] = OrderedDict()
+		self.cacheSize: int = cacheSize
+		self.cacheHits: int = 0
+		self.cacheMisses: int = 0
+
+		# these members make up the joint graph, whose joints are the positions where beam ends meet, identified by IDs;
+		# beams must be added and removed through addBeam and removeBeam to keep it up to date
+		self.beamIndex: Dict[int, int] = dict()                      # maps each beam's identity to its index in self.beams
+		self.beamJoints: List[Tuple[int, int]] = list()              # the joints at each beam's start and end, paired one to one with self.beams
+		self.joints: Dict[Tuple[float, float], int] = dict()         # maps each joint's position to its ID
+		self.jointBeams: Dict[int, List[Tuple[Beam, int]]] = dict()  # lists the beams whose ends lie at each joint, along with the end, 0 for the start and 1 for the end
+		self.nextJoint: int = 0
+
+		# this member holds the state of the last solve, reused by incremental solves
+		self.solveState: Union[SolveState, None] = None
+
+		# this member holds the solutions for each load case, along with the structural hash of the system they were found for
+		self.caseBasis: Union[Tuple[str, CaseBasis], None] = None
+
+	# this function returns the ID of the joint at a given position, creating the joint if there is none
+	def joint(self, position: Vector3) -> int:
+		key: Tuple[float, float] = (position.x, position.y)
+
+		if not key in self.joints:
+			self.joints[key] = self.nextJoint
+			self.jointBeams[self.nextJoint] = list()
+			self.nextJoint += 1
+
+		return self.joints[key]
+
+	# this function adds a beam to the system, given its start position, angle and end position,
+	# and attaches it to the beams whose ends lie at the same joints as its own
+	def addBeam(self, beam: Beam, start: Vector3, angle: float, end: Vector3):
+		joints: Tuple[int, int] = (self.joint(start), self.joint(end))
+
+		for (side, joint) in enumerate(joints):
+			for (other, otherSide) in self.jointBeams[joint]:
+				(other.start if otherSide == 0 else other.end)[1].append(beam)
+				(beam.start if side == 0 else beam.end)[1].append(other)
+
+		for (side, joint) in enumerate(joints):
+			self.jointBeams[joint].append((beam, side))
+
+		self.beamIndex[id(beam)] = len(self.beams)
+		self.beamJoints.append(joints)
+		self.beams.append((beam, start, angle, end))
+
+	# this function removes a beam from the system, detaching it from the beams it is attached to;
+	# removing the last added beam, as undoing does, takes constant time
+	def removeBeam(self, beam: Beam):
+		i: int = self.beamIndex.pop(id(beam))
+
+		for (side, joint) in enumerate(self.beamJoints[i]):
+			self.jointBeams[joint].remove((beam, side))
+
+			for (other, otherSide) in self.jointBeams[joint]:
+				(other.start if otherSide == 0 else other.end)[1].remove(beam)
+
+			if len(self.jointBeams[joint]) == 0:
+				del self.jointBeams[joint]
+				del self.joints[(self.beams[i][1].x, self.beams[i][1].y) if side == 0 else (self.beams[i][3].x, self.beams[i][3].y)]
+
+		beam.start[1].clear()
+		beam.end[1].clear()
+		del self.beams[i]
+		del self.beamJoints[i]
+
+		for j in range(i, len(self.beams)):
+			self.beamIndex[id(self.beams[j][0])] = j
+
+	# this function returns the index of a beam in self.beams
+	def indexOf(self, beam: Beam) -> int:
+		return self.beamIndex[id(beam)]
+
+	# this function returns the indices of the beams attached to the i-th beam's start or end, given by side as 0 or 1, respectively
+	def neighbors(self, i: int, side: int) -> List[int]:
+		return [self.beamIndex[id(other)] for (other, otherSide) in self.jointBeams[self.beamJoints[i][side]] if not other is self.beams[i][0]]
+
+	# this function lists the supports at a joint
+	def jointSupports(self, joint: int) -> List[Support]:
+		return [(beam.start if side == 0 else beam.end)[0] for (beam, side) in self.jointBeams[joint] if (beam.start if side == 0 else beam.end)[0] != None]
+
+	# this function returns a hash of what the coefficient matrix of the equilibrium equations and the list of supports depend on:
+	# the beams' geometry and joints, the supports at each beam's ends and the supports at each joint
+	def supportSignature(self) -> str:
+		description: List[tuple] = [
+			((start.x, start.y), angle, (end.x, end.y), joints, supportKey(beam.start[0]), supportKey(beam.end[0]))
+			for ((beam, start, angle, end), joints) in zip(self.beams, self.beamJoints)
+		]
+		description += [(joint, tuple(supportKey(s) for s in self.jointSupports(joint))) for joint in sorted(self.jointBeams)]
+
+		return blake2b(repr(description).encode(), digest_size = 16).hexdigest()
+
+	# this function returns a hash of everything the system's solution depends on: the beams' geometry and connections, their supports and their loads
+	def structuralHash(self) -> str:
+		description: List[tuple] = list()
+		for (beam, start, angle, end) in self.beams:
+			description.append((
+				beam.length, (start.x, start.y), angle, (end.x, end.y),
+				supportKey(beam.start[0]), supportKey(beam.end[0]),
+				tuple((c[0].magnitude, c[1], c[2], c[0].case) for c in beam.concentratedList),
+				tuple((d[0].length, tuple(d[0].distribution.coefficients), d[1], d[2], d[0].case) for d in beam.distributedList),
+				(beam.moment.magnitude, beam.moment.case) if beam.moment != None else None
+			))
+
+		return blake2b(repr(description).encode(), digest_size = 16).hexdigest()
+
+	# this function empties the solution cache
+	def clearCache(self):
+		self.solutionCache.clear()
+
+	# this function returns the system's solution, reusing the cached one when the system has not changed since it was solved;
+	# given a load case, only the loads of that case are taken into account
+	def solveSystem(self, case: Union[str, None] = None) -> Solution:
+		key: str = self.structuralHash() if case == None else self.structuralHash() + '/' + case
+
+		if key in self.solutionCache:
+			self.cacheHits += 1
+			self.solutionCache.move_to_end(key)
+			self.solveState = self.solutionCache[key]
+			return self.solveState.solution
+
+		self.cacheMisses += 1
+		(coefs, supports) = self.assembleSupports()
+		contributions: List[Vector3] = [self.loadContribution(i, case) for i in range(len(self.beams))]
 		b: Vector3 = Vector3(0, 0, 0)
+		for contribution in contributions:
+			b += contribution
+
+		self.solveState = self.solveBeams(coefs, b, supports, contributions, None, set(), case)
+		self.cacheState(key)
+		return self.solveState.solution
+
+	# this function lists the load cases of the system's loads
+	def loadCases(self) -> List[str]:
+		cases: Set[str] = set()
+		for (beam, start, angle, end) in self.beams:
+			cases.update(f[0].case for f in beam.loads())
+			if beam.moment != None:
+				cases.add(beam.moment.case)
+
+		return sorted(cases)
+
+	# this function solves the system once for each of its load cases and returns the basis from which any combination of them is found,
+	# reusing the previous basis when the system has not changed since it was built
+	def solveCases(self) -> CaseBasis:
+		key: str = self.structuralHash()
+
+		if self.caseBasis == None or self.caseBasis[0] != key:
+			cases: List[str] = self.loadCases()
+			self.caseBasis = (key, CaseBasis(cases, [self.solveSystem(case) for case in cases], [b[0] for b in self.beams]))
+
+		return self.caseBasis[1]
+
+	# this function returns the influence lines of a stress type, given by polyID, at each of the given sections, given as pairs of the index of a beam
+	# and the position along it, for a unit load at the given angle moving along a path, given as the indices of its beams from start to end
+	def influenceLines(self, path: List[int], sections: List[Tuple[int, float]], polyID: int, angle: float = 90) -> List[InfluenceLine]:
+		return influenceLines(self, path, sections, polyID, angle)
+
+	# this function returns the largest and smallest stress of a type, given by polyID, at each of the given sections for a train of loads
+	# moving along a path, given as a list of pairs of the distance from each of its loads to its leading one and the load's magnitude
+	def movingLoadEnvelope(self, path: List[int], sections: List[Tuple[int, float]], polyID: int, train: List[Tuple[float, float]], step: float, angle: float = 90) -> Tuple[ndarray, ndarray]:
+		return movingLoadEnvelope(self, path, sections, polyID, train, step, angle)
+
+	# this function solves the system again after only the loads of the given beams changed: it updates the previous solve's load vector
+	# by the difference of those beams' contributions, re-solves the supports' reactions and runs Beam.solve again only for the changed beams
+	# and the beams whose boundary reactions changed; when there is no previous solve of the same beams and supports, the whole system is solved
+	def solveIncremental(self, changed: Iterable[Beam]) -> Solution:
+		previous: Union[SolveState, None] = self.solveState
+		if previous == None or previous.case != None or len(previous.contributions) != len(self.beams) or previous.supportSignature != self.supportSignature():
+			return self.solveSystem()
+
+		contributions: List[Vector3] = previous.contributions.copy()
+		b: Vector3 = previous.b.__copy__()
+		changedIndices: Set[int] = set()
+
+		for beam in changed:
+			i: int = self.indexOf(beam)
+			contributions[i] = self.loadContribution(i)
+			b += contributions[i] - previous.contributions[i]
+			changedIndices.add(i)
+
+		self.solveState = self.solveBeams(previous.coefs, b, previous.supports, contributions, previous, changedIndices)
+		self.cacheState(self.structuralHash())
+		return self.solveState.solution
+
+	# this function solves the system by the direct stiffness method, which also solves hyperstatic systems and systems with closed loops,
+	# taking every joint as rigid; it does not use the solution cache
+	def solveStiffness(self) -> Solution:
+		return Frame(self.beams, self.beamJoints).solve()
 
-		supports: List[Tuple[Vector3, Vector3]] = list()  # the first vector is the reaction force from the support and the second one is its position with respect to the center of the coordinate system
+	# this function solves the system by the direct stiffness method, as solveStiffness does, and also finds the elastic curves of its beams
+	# from the beams' rigidities and the joints' displacements; it does not use the solution cache
+	def solveDeflections(self) -> Tuple[Solution, Deflections]:
+		frame: Frame = Frame(self.beams, self.beamJoints)
+		(displacements, magnitudes) = frame.solveDisplacements()
+		solution: Solution = frame.solution(displacements, magnitudes)
+		return (solution, Deflections(frame, displacements, solution))
 
-		# this function scales the beams' dimensions to properly solve the system
-		def scaleBeam(b):
-			return (b[0], Vector3(b[1].x, -b[1].y, b[1].z)*0.1, b[2], Vector3(b[3].x, -b[3].y, b[3].z)*0.1)
+	# this function finds the system's lowest natural modes, each beam being split into the given number of elements
+	def naturalModes(self, count: int = 6, divisions: int = 8) -> Modes:
+		return naturalModes(self.beams, self.beamJoints, count, divisions)
+
+	# this function solves a system made of continuous beams, chains of collinear beams joined end to end with a support at every
+	# inner joint, through the three-moment equations, in time proportional to the number of beams; it does not use the solution cache
+	def solveContinuous(self) -> Solution:
+		return solveContinuous(self.beams, self.beamJoints)
+
+	# this function solves the system as a statically determinate truss, whose members only carry axial forces,
+	# through the equilibrium of every joint at once; it does not use the solution cache
+	def solveTruss(self) -> TrussSolution:
+		return solveTruss(self.beams, self.beamJoints)
+
+	# this function stores the current solve state in the solution cache
+	def cacheState(self, key: str):
+		if self.cacheSize > 0:
+			self.solutionCache[key] = self.solveState
+			while len(self.solutionCache) > self.cacheSize:
+				self.solutionCache.popitem(last = False)
+
+	# this function scales the i-th beam's dimensions to properly solve the system
+	def scaledBeam(self, i: int) -> Tuple[Beam, Vector3, float, Vector3]:
+		b: Tuple[Beam, Vector3, float, Vector3] = self.beams[i]
+		return (b[0], Vector3(b[1].x, -b[1].y, b[1].z)*0.1, b[2], Vector3(b[3].x, -b[3].y, b[3].z)*0.1)
+
+	# this function returns the contribution of the i-th beam's loads, or only the ones of a given load case, along with extra concentrated forces
+	# as if they were applied on it, to the right hand side of the system's equilibrium equations
+	def loadContribution(self, i: int, case: Union[str, None] = None, extraLoads: Union[List[Tuple[Concentrated, float, float]], None] = None) -> Vector3:
+		b: Vector3 = Vector3(0, 0, 0)
+		beam: Tuple[Beam, Vector3, float, Vector3] = self.scaledBeam(i)
+
+		for concentrated in beam[0].concentratedList + list(extraLoads or ()):
+			if case != None and concentrated[0].case != case:
+				continue
+
+			force: Vector3 = concentrated[0].forceVector(concentrated[2] - beam[2])
+			pos: Vector3 = beam[0].pointPos(beam[1], concentrated[1], beam[2])
+			b.x -= force.x
+			b.y -= force.y
+			b.z -= force.y*pos.x - force.x*pos.y
+
+		for distributed in beam[0].distributedList:
+			if case != None and distributed[0].case != case:
+				continue
+
+			equivalent: Tuple[Concentrated, float] = distributed[0].equivalent()
+			force: Vector3 = equivalent[0].forceVector(distributed[2] - beam[2])
+			pos: Vector3 = beam[0].pointPos(beam[1], distributed[1] + equivalent[1], beam[2])
+			b.x -= force.x
+			b.y -= force.y
+			b.z -= force.y*pos.x - force.x*pos.y
+
+		if beam[0].moment != None and (case == None or beam[0].moment.case == case):
+			b.z -= beam[0].moment.magnitude
+
+		return b
+
+	# this function lists the system's supports and builds the coefficient matrix of its equilibrium equations
+	def assembleSupports(self) -> Tuple[Matrix3x3, List[Tuple[Vector3, Vector3, int, int]]]:
+		coefs: Matrix3x3 = Matrix3x3([[0, 0, 0], [0, 0, 0], [0, 0, 0]])
+		supports: List[Tuple[Vector3, Vector3, int, int]] = list()  # the first vector is the support's unit reaction vector and the second one is its position with respect to the center of the coordinate system,
+		                                                            # while the integers are the index of the beam it is attached to and the end it is attached at, 0 for the start and 1 for the end
+		for index in range(len(self.beams)):
+			beam: Tuple[Beam, Vector3, float, Vector3] = self.scaledBeam(index)
 
-		scaledBeams: List[Tuple[Beam, Vector3, float, Vector3]] = list(map(lambda b: scaleBeam(b), self.beams.copy()))
-		for beam in scaledBeams:
 			if beam[0].start[0] != None:
-				supports.append((beam[0].start[0].reaction, beam[1]))
+				supports.append((beam[0].start[0].reaction, beam[1], index, 0))
 
 			if beam[0].end[0] != None:
-				supports.append((beam[0].end[0].reaction, beam[3]))
-
-			for concentrated in beam[0].concentratedList:
-				force: Vector3 = concentrated[0].forceVector(concentrated[2] - beam[2])
-				pos: Vector3 = beam[0].pointPos(beam[1], concentrated[1], beam[2])
-				b.x -= force.x
-				b.y -= force.y
-				b.z -= force.y*pos.x - force.x*pos.y
-
-			for distributed in beam[0].distributedList:
-				equivalent: Tuple[Concentrated, float] = distributed[0].equivalent()
-				force: Vector3 = equivalent[0].forceVector(distributed[2] - beam[2])
-				pos: Vector3 = beam[0].pointPos(beam[1], distributed[1] + equivalent[1], beam[2])
-				b.x -= force.x
-				b.y -= force.y
-				b.z -= force.y*pos.x - force.x*pos.y
-
-			if beam[0].moment != None:
-				b.z -= beam[0].moment.magnitude
+				supports.append((beam[0].end[0].reaction, beam[3], index, 1))
+
+		if sum((2 if s[0].x == 1 and s[0].y == 1 else 1) + (1 if s[0].z != 0 else 0) for s in supports) != 3:
+			raise Exception('System is not isostatic!')
 
 		i: int = 0
 		for s in supports:
@@ -64,75 +330,136 @@ class System:
 				coefs[2][i] = s[0].z
 				i += 1
 
+		return (coefs, supports)
 
-		if i == 3:
-			result: Vector3 = solve(coefs, b)
-			r: List[float, float, float] = [result.x, result.y, result.z]
+	# this function calculates the supports' reaction vectors and uses them to calculate the beams' stress functions, leaving the system untouched;
+	# given a previous solve, the beams that are not listed as changed and whose boundary reactions are the same reuse their previous stress functions;
+	# extra concentrated forces, mapped from the indices of the beams they act on, are taken into account as if applied on those beams
+	def solveBeams(self, coefs: Matrix3x3, b: Vector3, supports: List[Tuple[Vector3, Vector3, int, int]], contributions: List[Vector3], previous: Union[SolveState, None], changed: Set[int], case: Union[str, None] = None, extraLoads: Union[Dict[int, List[Tuple[Concentrated, float, float]]], None] = None) -> SolveState:
+		if extraLoads == None:
+			extraLoads = dict()
 
-			i = 0
-			for s in supports:
-				if s[0].x == 1 and s[0].y == 1:
-					s[0].x *= r[i]
-					i += 1
-				else:
-					s[0].x *= r[i]
+		reactions: List[List[Union[Vector3, None]]] = [[None, None] for beam in self.beams]
+
+		(result, singular) = solveBatch(array([coefs.data], dtype = float64), array([[b.x, b.y, b.z]], dtype = float64))
+		if singular[0]:
+			raise Exception('System is hypostatic!')
+		r: List[float, float, float] = result[0].tolist()
 
-				s[0].y *= r[i]
+		i: int = 0
+		for s in supports:
+			reaction: Vector3 = s[0].__copy__()
+			if s[0].x == 1 and s[0].y == 1:
+				reaction.x *= r[i]
 				i += 1
+			else:
+				reaction.x *= r[i]
 
-				if s[0].z != 0:
-					s[0].z *= r[i]
-					i += 1
+			reaction.y *= r[i]
+			i += 1
 
-		else:
-			raise Exception('System is not isostatic!')
+			if s[0].z != 0:
+				reaction.z *= r[i]
+				i += 1
+
+			reactions[s[2]][s[3]] = reaction
+
+		solution: List[Union[BeamSolution, None]] = [None]*len(self.beams)
+		inputs: List[Union[Tuple[Vector3, bool], None]] = [None]*len(self.beams)
+		outputs: List[Union[Vector3, None]] = [None]*len(self.beams)
+
+		# this function solves a beam, unless it can reuse the previous solve's stress functions
+		def solveBeam(i: int, v: Vector3, endFirst: bool) -> Vector3:
+			inputs[i] = (v, endFirst)
+
+			if previous != None and not i in changed and previous.inputs[i] != None and previous.inputs[i][1] == endFirst and closeVectors(previous.inputs[i][0], v) \
+				and all(closeVectors(a, c) if a != None and c != None else a == c for (a, c) in zip(previous.reactions[i], reactions[i])):
+				solution[i] = previous.solution.beams[i]
+				outputs[i] = previous.outputs[i]
+			else:
+				(outputs[i], solution[i]) = self.beams[i][0].solve(v, self.beams[i][2], endFirst, reactions[i], case, extraLoads.get(i))
 
-		solution: List[Callable[[int, float], float]] = [None]*len(self.beams)
+			return outputs[i]
 
-		# this function searches through the beams following a DFS and solves them,
-		# and returns the reaction vector used for solving the parent beam
-		def findReaction(b: Beam, p: Union[Beam, None]) -> Tuple[Vector3, float]:  # tuple float is the beam's angle
+		order: List[int] = list()  # the indices of the beams in the order they were solved
+
+		# this function finds the vector a beam is solved with and the direction it is solved in, along with the beams
+		# whose reactions make up that vector, given the index of the beam it is reached from
+		def expand(i: int, p: Union[int, None]) -> Tuple[Vector3, bool, List[int]]:
 			v: Vector3 = Vector3(0, 0, 0)
-			endFirst: bool
-			for i in range(len(self.beams)):
-				if b == self.beams[i][0]:
-					break
-
-			if len(b.start[1]) == 0:
-				endFirst = False
-				if b.start[0] != None:
-					v = rotate(b.start[0].reaction, -self.beams[i][2])
-			elif len(b.end[1]) == 0:
-				endFirst = True
-				if b.end[0] != None:
-					v = rotate(b.end[0].reaction, -self.beams[i][2])
+			start: List[int] = self.neighbors(i, 0)
+			end: List[int] = self.neighbors(i, 1)
+
+			if len(start) == 0:
+				if reactions[i][0] != None:
+					v = rotate(reactions[i][0], -self.beams[i][2])
+				return (v, False, [])
+			elif len(end) == 0:
+				if reactions[i][1] != None:
+					v = rotate(reactions[i][1], -self.beams[i][2])
+				return (v, True, [])
 			elif p != None:
-				if p in b.start[1]:
-					endFirst = True
-					for c in b.end[1]:
-						r: Tuple[Vector3, float] = findReaction(c, b)
-						v += rotate(r[0], r[1] - self.beams[i][2])
-				elif p in b.end[1]:
-					endFirst = False
-					for c in b.start[1]:
-						r: Tuple[Vector3, float] = findReaction(c, b)
-						v += rotate(r[0], r[1] - self.beams[i][2])
+				# the reaction of a support at the end the beam is solved from adds to the beams attached there
+				if p in start:
+					if reactions[i][1] != None:
+						v = rotate(reactions[i][1], -self.beams[i][2])
+					return (v, True, end)
+				elif p in end:
+					if reactions[i][0] != None:
+						v = rotate(reactions[i][0], -self.beams[i][2])
+					return (v, False, start)
 				else:
 					raise Exception('Cannot find parent!')
 			else:
 				raise Exception('Parent not given!')
 
-			v = b.solve(v, self.beams[i][2], endFirst)
-			solution[i] = b.stress
-			return (v, self.beams[i][2])
-
-		for b in self.beams:
-			if len(b[0].start[1]) == 0 or len(b[0].end[1]) == 0:
-				findReaction(b[0], None)
-				for beam in b[0].start[1]:
-					findReaction(beam, b[0])
-				for beam in b[0].end[1]:
-					findReaction(beam, b[0])
+		# this function solves the beams hanging from a beam, reached from its parent, in post-order: each beam is solved after
+		# the beams attached to its far end, with the sum of their returned reaction vectors; an explicit stack replaces recursion
+		# so that long chains of beams do not exhaust the interpreter's recursion limit
+		def solveSubtree(root: int, parent: Union[int, None]):
+			stack: List[Tuple[int, Union[int, None], Union[Tuple[Vector3, bool, List[int]], None]]] = [(root, parent, None)]
+
+			while len(stack) > 0:
+				(i, p, expansion) = stack.pop()
+
+				if expansion == None:
+					if inputs[i] != None:
+						raise Exception('System has a closed loop!')
+
+					expansion = expand(i, p)
+					inputs[i] = (expansion[0], expansion[1])
+					stack.append((i, p, expansion))
+					stack.extend((c, i, None) for c in reversed(expansion[2]))
+				else:
+					(v, endFirst, children) = expansion
+					for c in children:
+						v += rotate(outputs[c], self.beams[c][2] - self.beams[i][2])
+
+					solveBeam(i, v, endFirst)
+					order.append(i)
+
+		for i in range(len(self.beams)):
+			if len(self.neighbors(i, 0)) == 0 or len(self.neighbors(i, 1)) == 0:
+				solveSubtree(i, None)
+				for c in self.neighbors(i, 0) + self.neighbors(i, 1):
+					solveSubtree(c, i)
 				break
 
-		return solution
+		return SolveState(
+			coefs, b, supports, contributions, reactions, inputs, outputs,
+			Solution(
+				tuple(tuple((r.x, r.y, r.z) if r != None else None for r in ends) for ends in reactions),
+				tuple(solution),
+				tuple(order)
+			),
+			case,
+			self.supportSignature()
+		)
+
+# this function returns what identifies a support in the system's hashes, its unit reaction vector, or None when there is no support
+def supportKey(support: Union[Support, None]):
+	return None if support == None else (support.reaction.x, support.reaction.y, support.reaction.z)
+
+# this function tells whether two vectors are equal up to rounding errors
+def closeVectors(a: Vector3, b: Vector3) -> bool:
+	return isclose(a.x, b.x, rel_tol = 1e-12, abs_tol = 1e-12) and isclose(a.y, b.y, rel_tol = 1e-12, abs_tol = 1e-12) and isclose(a.z, b.z, rel_tol = 1e-12, abs_tol = 1e-12)
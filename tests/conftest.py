@@ -0,0 +1,5 @@
+import sys
+from os.path import dirname, abspath
+
+# the modules are imported from the repository's root, as main.py and pef.py import them
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
@@ -0,0 +1,57 @@
+from pytest import approx, raises
+from numpy import linspace
+from model import buildSystem
+
+# this function flips a beam's description, so that it is drawn from its end to its start, along with its supports
+def backwards(description):
+	flipped = {key: value for (key, value) in description.items() if not key in ("startSupport", "endSupport")}
+	(flipped["start"], flipped["end"]) = (description["end"], description["start"])
+	if "endSupport" in description:
+		flipped["startSupport"] = description["endSupport"]
+	if "startSupport" in description:
+		flipped["endSupport"] = description["startSupport"]
+	return flipped
+
+# an isostatic beam with an overhang, split into a simply supported span and a cantilever, which the equilibrium equations also solve
+SPAN = {"start": [0, 0], "end": [5, 0], "startSupport": {"type": "PINNED"}, "endSupport": {"type": "SIMPLE", "angle": 90}, "distributed": [{"length": 3, "distribution": [1, 0.4], "position": 1, "angle": 90}]}
+OVERHANG = {"start": [5, 0], "end": [7, 0], "concentrated": [{"magnitude": 3, "position": 1.5, "angle": 90}]}
+
+def compare(beams):
+	system = buildSystem({"beams": beams})
+	continuous = system.solveContinuous()
+	equilibrium = system.solveSystem()
+
+	for (i, beamItem) in enumerate(system.beams):
+		for (r, expected) in zip(continuous.reactions[i], equilibrium.reactions[i]):
+			assert (r == None) == (expected == None)
+			if r != None:
+				assert r == approx(expected, abs = 1e-9)
+
+		xs = linspace(0, beamItem[0].length, 21)
+		assert continuous.beams[i].stresses(xs) == approx(equilibrium.beams[i].stresses(xs), abs = 1e-9)
+
+def testIsostaticBeamMatchesEquilibrium():
+	compare([SPAN, OVERHANG])
+
+def testBackwardsBeamsMatchEquilibrium():
+	compare([backwards(SPAN), OVERHANG])
+	compare([SPAN, backwards(OVERHANG)])
+	compare([backwards(OVERHANG), backwards(SPAN)])
+
+# two equal spans under a uniform load q have a moment of -qL^2/8 over the middle support, which takes 5qL/4
+def testTwoSpansMiddleSupport():
+	(L, q) = (4, 3)
+	load = [{"length": L, "distribution": [q], "position": 0, "angle": 90}]
+	system = buildSystem({"beams": [
+		{"start": [0, 0], "end": [L, 0], "startSupport": {"type": "PINNED"}, "endSupport": {"type": "SIMPLE", "angle": 90}, "distributed": load},
+		{"start": [L, 0], "end": [2*L, 0], "endSupport": {"type": "SIMPLE", "angle": 90}, "distributed": load}
+	]})
+	solution = system.solveContinuous()
+
+	assert solution.beams[0].stress(2, L) == approx(-q*L**2/8)
+	assert solution.reactions[0][1][1] == approx(5*q*L/4)
+
+def testBranchIsRejected():
+	system = buildSystem({"beams": [SPAN, OVERHANG, {"start": [5, 0], "end": [5, 2]}]})
+	with raises(Exception):
+		system.solveContinuous()
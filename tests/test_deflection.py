@@ -0,0 +1,25 @@
+from pytest import approx
+from model import buildSystem
+
+(L, EI, EA) = (4, 2e4, 1e6)
+
+# a simply supported beam under a uniform load q sags by 5qL^4/384EI at its middle, where it does not rotate, and rotates by qL^3/24EI at its ends
+def testSimplySupportedUniformLoad():
+	q = 2
+	system = buildSystem({"beams": [{"start": [0, 0], "end": [L, 0], "EI": EI, "startSupport": {"type": "PINNED"}, "endSupport": {"type": "SIMPLE", "angle": 90}, "distributed": [{"length": L, "distribution": [q], "position": 0, "angle": 90}]}]})
+	(axial, deflection, rotation) = system.solveDeflections()[1].beam(0)
+
+	assert deflection(L/2) == approx(-5*q*L**4/(384*EI))
+	assert rotation(L/2) == approx(0, abs = 1e-12)
+	assert rotation(0) == approx(-q*L**3/(24*EI))
+	assert deflection(0) == approx(0, abs = 1e-12) and deflection(L) == approx(0, abs = 1e-12)
+
+# a cantilever with a load P at its tip sags by PL^3/3EI and rotates by PL^2/2EI there, and one pulled by a force F along it stretches by FL/EA
+def testCantileverTipLoad():
+	(P, F) = (3, 5)
+	system = buildSystem({"beams": [{"start": [0, 0], "end": [L, 0], "EI": EI, "EA": EA, "startSupport": {"type": "FIXED"}, "concentrated": [{"magnitude": P, "position": L, "angle": 90}, {"magnitude": F, "position": L, "angle": 0}]}]})
+	(axial, deflection, rotation) = system.solveDeflections()[1].beam(0)
+
+	assert deflection(L) == approx(-P*L**3/(3*EI))
+	assert rotation(L) == approx(-P*L**2/(2*EI))
+	assert axial(L) == approx(F*L/EA)
@@ -0,0 +1,22 @@
+from math import pi, sqrt
+from pytest import approx
+from model import buildSystem
+
+(L, EI, mass) = (4, 2e4, 0.03925)
+
+# the natural frequencies of a beam in bending are (bL)^2/(2 pi L^2) sqrt(EI/m), bL being the roots of its frequency equation: n pi when it is simply supported
+# and 1.8751, 4.6941, ... when it is a cantilever
+def frequency(bL: float) -> float:
+	return bL**2/(2*pi*L**2)*sqrt(EI/mass)
+
+def testSimplySupportedFrequencies():
+	system = buildSystem({"beams": [{"start": [0, 0], "end": [L, 0], "EI": EI, "mass": mass, "startSupport": {"type": "PINNED"}, "endSupport": {"type": "SIMPLE", "angle": 90}}]})
+	frequencies = system.naturalModes(2, 16).frequencies()
+
+	assert frequencies == approx([frequency(pi), frequency(2*pi)], rel = 1e-4)
+
+def testCantileverFrequencies():
+	system = buildSystem({"beams": [{"start": [0, 0], "end": [L, 0], "EI": EI, "mass": mass, "startSupport": {"type": "FIXED"}}]})
+	frequencies = system.naturalModes(2, 16).frequencies()
+
+	assert frequencies == approx([frequency(1.875104069), frequency(4.694091133)], rel = 1e-4)
@@ -0,0 +1,29 @@
+from pytest import approx
+from numpy import linspace
+from model import buildSystem
+
+# an isostatic frame, a column fixed at its base holding a beam with a distributed and a concentrated load, which the equilibrium equations also solve
+FRAME = {"beams": [
+	{"start": [0, 0], "end": [0, 3], "startSupport": {"type": "FIXED"}, "concentrated": [{"magnitude": 2, "position": 1.5, "angle": 90}]},
+	{"start": [0, 3], "end": [4, 3], "concentrated": [{"magnitude": 5, "position": 3, "angle": 90}], "distributed": [{"length": 2, "distribution": [1, 0.5], "position": 0.5, "angle": 90}]}
+]}
+
+def testIsostaticFrameMatchesEquilibrium():
+	system = buildSystem(FRAME)
+	stiffness = system.solveStiffness()
+	equilibrium = system.solveSystem()
+
+	assert stiffness.reactions[0][0] == approx(equilibrium.reactions[0][0], abs = 1e-9)
+	for (i, beamItem) in enumerate(system.beams):
+		xs = linspace(0, beamItem[0].length, 21)
+		assert stiffness.beams[i].stresses(xs) == approx(equilibrium.beams[i].stresses(xs), abs = 1e-9)
+
+# a beam fixed at both ends under a uniform load q has end moments of qL^2/12 and a moment of qL^2/24 at its middle
+def testFixedBeamMoments():
+	(L, q) = (6, 2)
+	system = buildSystem({"beams": [{"start": [0, 0], "end": [L, 0], "startSupport": {"type": "FIXED"}, "endSupport": {"type": "FIXED"}, "distributed": [{"length": L, "distribution": [q], "position": 0, "angle": 90}]}]})
+	bending = system.solveStiffness().beams[0].stressFunctions[2]
+
+	assert bending(0) == approx(-q*L**2/12)
+	assert bending(L/2) == approx(q*L**2/24)
+	assert bending(L) == approx(-q*L**2/12)
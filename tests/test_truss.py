@@ -0,0 +1,28 @@
+from math import atan2, degrees
+from pytest import approx, raises
+from model import buildSystem
+
+# a triangle truss, 2a wide and h high, pinned at one end of its base and simply supported at the other, holding a load P at its apex: each rafter
+# is pushed by P/(2 sin t), t being its angle with the base, and the base is pulled by P/(2 tan t), while each support takes P/2
+def testTriangle():
+	(a, h, P) = (4, 3, 12)
+	rafter = (a**2 + h**2)**0.5
+	angle = round(degrees(atan2(h, a)), 6)
+	system = buildSystem({"beams": [
+		{"start": [0, 0], "end": [2*a, 0], "startSupport": {"type": "PINNED"}, "endSupport": {"type": "SIMPLE", "angle": 90}},
+		{"start": [0, 0], "end": [a, h], "concentrated": [{"magnitude": P, "position": rafter, "angle": angle + 90}]},  # the load's angle is taken from the member
+		{"start": [a, h], "end": [2*a, 0]}
+	]})
+	solution = system.solveTruss()
+
+	assert solution.forces == approx((P/2*a/h, -P/2*rafter/h, -P/2*rafter/h))
+	assert solution.reactions[0][0][:2] == approx((0, P/2), abs = 1e-9)
+	assert solution.reactions[0][1][:2] == approx((0, P/2), abs = 1e-9)
+
+def testMechanismIsRejected():
+	system = buildSystem({"beams": [
+		{"start": [0, 0], "end": [4, 0], "startSupport": {"type": "PINNED"}},
+		{"start": [4, 0], "end": [4, 3], "endSupport": {"type": "SIMPLE", "angle": 90}}
+	]})
+	with raises(Exception):
+		system.solveTruss()
@@ -0,0 +1,100 @@
+from typing import List, Tuple, Dict, Union
+from warnings import catch_warnings, simplefilter
+from numpy import ndarray, array, zeros, arange, concatenate, isfinite, float64
+from scipy.sparse import coo_matrix
+from scipy.sparse.linalg import spsolve, MatrixRankWarning
+from auxiliary.algebra import Vector3, psin, pcos
+from beam import Beam
+from solution import TrussSolution
+
+# a truss is solved through the method of joints: its beams are taken as members pinned at the joints of the system's joint graph, carrying only axial forces,
+# and the equilibrium of forces at every joint gives two equations on the members' forces and the supports' reactions, which must be as many as the equations;
+# fixed supports are taken as pinned, as the members do not carry moments
+
+# this function splits a member's loads between the joints at its ends, as if it were simply supported on them, and returns the forces applied on each joint
+def jointLoads(beam: Beam, angle: float) -> Tuple[Vector3, Vector3]:
+	start: Vector3 = Vector3(0, 0, 0)
+	end: Vector3 = Vector3(0, 0, 0)
+
+	for (force, position, forceAngle) in beam.concentratedList:
+		v: Vector3 = force.forceVector(forceAngle - angle)
+		start += v*(1 - position/beam.length)
+		end += v*(position/beam.length)
+
+	for (force, position, forceAngle) in beam.distributedList:
+		equivalent = force.equivalent()
+		v: Vector3 = equivalent[0].forceVector(forceAngle - angle)
+		start += v*(1 - (position + equivalent[1])/beam.length)
+		end += v*((position + equivalent[1])/beam.length)
+
+	if beam.moment != None:
+		couple: Vector3 = Vector3(-psin(angle), pcos(angle), 0)*(beam.moment.magnitude/beam.length)
+		start -= couple
+		end += couple
+
+	return (start, end)
+
+# this function solves a system as a truss, given its beams and the joints at their start and end
+def solveTruss(beams: List[Tuple[Beam, Vector3, float, Vector3]], beamJoints: List[Tuple[int, int]]) -> TrussSolution:
+	nodes: Dict[int, int] = dict()
+	for joints in beamJoints:
+		for joint in joints:
+			nodes.setdefault(joint, len(nodes))
+
+	m: int = len(beams)
+	memberNodes: ndarray = array([[nodes[joint] for joint in joints] for joints in beamJoints], dtype = int).reshape(-1, 2)
+	c: ndarray = array([pcos(b[2]) for b in beams], dtype = float64)
+	s: ndarray = array([psin(b[2]) for b in beams], dtype = float64)
+
+	# a pulled member pulls the joint at its start towards its end and the joint at its end towards its start
+	rows: List[ndarray] = [2*memberNodes[:, 0], 2*memberNodes[:, 0] + 1, 2*memberNodes[:, 1], 2*memberNodes[:, 1] + 1]
+	cols: List[ndarray] = [arange(m)]*4
+	values: List[ndarray] = [c, s, -c, -s]
+
+	# each support adds one unknown along each direction it restrains, listed along with the index of the member it is attached to and the end it is attached at
+	unknowns: List[Tuple[Vector3, int, int]] = list()
+	supported: Dict[int, int] = dict()
+	for (i, (beam, start, angle, end)) in enumerate(beams):
+		for (side, support) in enumerate((beam.start[0], beam.end[0])):
+			if support == None:
+				continue
+
+			node: int = memberNodes[i, side]
+			if node in supported:
+				raise Exception('Joint has more than one support!')
+			supported[node] = i
+
+			r: Vector3 = support.reaction
+			for direction in ([Vector3(1, 0, 0), Vector3(0, 1, 0)] if r.x == 1 and r.y == 1 else [Vector3(r.x, r.y, 0)]):
+				rows.append([2*node, 2*node + 1])
+				cols.append([m + len(unknowns)]*2)
+				values.append([direction.x, direction.y])
+				unknowns.append((direction, i, side))
+
+	if 2*len(nodes) != m + len(unknowns):
+		raise Exception('Truss is not statically determinate!')
+
+	loads: ndarray = zeros(2*len(nodes))
+	for (i, (beam, start, angle, end)) in enumerate(beams):
+		for (side, v) in enumerate(jointLoads(beam, angle)):
+			loads[2*memberNodes[i, side]] -= v.x
+			loads[2*memberNodes[i, side] + 1] -= v.y
+
+	matrix = coo_matrix((concatenate(values).astype(float64), (concatenate(rows), concatenate(cols))), shape = (len(loads), len(loads))).tocsc()
+	with catch_warnings():
+		simplefilter('ignore', MatrixRankWarning)
+		x: ndarray = spsolve(matrix, loads)
+
+	if not isfinite(x).all():
+		raise Exception('System is hypostatic!')
+
+	reactions: List[List[Union[Vector3, None]]] = [[None, None] for beam in beams]
+	for ((direction, i, side), magnitude) in zip(unknowns, x[m:].tolist()):
+		if reactions[i][side] == None:
+			reactions[i][side] = Vector3(0, 0, 0)
+		reactions[i][side] += direction*magnitude
+
+	return TrussSolution(
+		tuple(tuple((r.x, r.y, r.z) if r != None else None for r in ends) for ends in reactions),
+		tuple(x[:m].tolist())
+	)